@@ -4,6 +4,7 @@ Detects grid, hedge, and DCA patterns
 """
 
 import pandas as pd
+import numpy as np
 import sqlite3
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
@@ -53,68 +54,50 @@ def load_all_trades(db_path='data/trading_data.db'):
 
     # Reconstruct trades from deals
     # entry: 0=IN, 1=OUT, 2=INOUT, 3=OUT_BY
-    trades = []
-    skipped_no_entry = 0
-    skipped_nan = 0
-
     print(f"\nReconstructing trades from deals...")
 
-    for position_id in deals_df['position_id'].unique():
-        if pd.isna(position_id):
-            skipped_nan += 1
-            continue
-
-        position_deals = deals_df[deals_df['position_id'] == position_id].sort_values('time')
-
-        # Get entry deal (entry=0 IN or entry=2 INOUT)
-        entry_deals = position_deals[position_deals['entry'].isin([0, 2])]
-        if entry_deals.empty:
-            skipped_no_entry += 1
-            continue
-
-        entry_deal = entry_deals.iloc[0]
-
-        # Get exit deal (entry=1 OUT or entry=2 INOUT or entry=3 OUT_BY)
-        exit_deals = position_deals[position_deals['entry'].isin([1, 2, 3])]
-        exit_deal = exit_deals.iloc[-1] if not exit_deals.empty else None
-
+    skipped_nan = int(deals_df['position_id'].isna().any())
+    deals_df = deals_df[deals_df['position_id'].notna()].sort_values(['position_id', 'time'], kind='stable')
+
+    # Entry deal = first IN/INOUT deal, exit deal = last OUT/INOUT/OUT_BY deal per position
+    entry_deals = deals_df[deals_df['entry'].isin([0, 2])].drop_duplicates('position_id', keep='first')
+    entry_deals = entry_deals.set_index('position_id')
+    exit_deals = deals_df[deals_df['entry'].isin([1, 2, 3])].drop_duplicates('position_id', keep='last')
+    exit_deals = exit_deals.set_index('position_id').reindex(entry_deals.index)
+    skipped_no_entry = deals_df['position_id'].nunique() - len(entry_deals)
+
+    # Calculate total profit for each position
+    totals = deals_df.groupby('position_id')[['profit', 'commission', 'swap']].sum().reindex(entry_deals.index)
+
+    position_ids = entry_deals.index.to_numpy(dtype='int64')
+    trades_df = pd.DataFrame({
+        'ticket': position_ids,
+        'position_id': position_ids,
+        'order': entry_deals['order'].to_numpy(),
+        'symbol': pd.Categorical(entry_deals['symbol'].to_numpy()),
         # Convert type: 0=BUY, 1=SELL
-        trade_type = 'buy' if entry_deal['type'] == 0 else 'sell'
-
-        # Calculate total profit for position
-        position_profit = position_deals['profit'].sum()
-        position_commission = position_deals['commission'].sum()
-        position_swap = position_deals['swap'].sum()
-
-        trade = {
-            'ticket': int(position_id),
-            'position_id': int(position_id),
-            'order': int(entry_deal['order']) if pd.notna(entry_deal['order']) else None,
-            'symbol': entry_deal['symbol'],
-            'trade_type': trade_type,
-            'entry_time': entry_deal['time'],
-            'entry_price': float(entry_deal['price']),
-            'volume': float(entry_deal['volume']),
-            'exit_time': exit_deal['time'] if exit_deal is not None else None,
-            'exit_price': float(exit_deal['price']) if exit_deal is not None else None,
-            'profit': float(position_profit),
-            'commission': float(position_commission),
-            'swap': float(position_swap),
-            'magic_number': int(entry_deal['magic']) if pd.notna(entry_deal['magic']) else None,
-            'comment': entry_deal['comment'] if pd.notna(entry_deal['comment']) else '',
-            'stop_loss': None,
-            'take_profit': None
-        }
-
-        trades.append(trade)
+        'trade_type': pd.Categorical.from_codes(
+            (entry_deals['type'].to_numpy() != 0).astype(np.int8), categories=['buy', 'sell']
+        ),
+        'entry_time': entry_deals['time'].to_numpy(),
+        'entry_price': entry_deals['price'].to_numpy(dtype=float),
+        'volume': entry_deals['volume'].to_numpy(dtype=float),
+        'exit_time': exit_deals['time'].to_numpy(),
+        'exit_price': exit_deals['price'].to_numpy(dtype=float),
+        'profit': totals['profit'].to_numpy(dtype=float),
+        'commission': totals['commission'].to_numpy(dtype=float),
+        'swap': totals['swap'].to_numpy(dtype=float),
+        'magic_number': entry_deals['magic'].to_numpy(),
+        'comment': entry_deals['comment'].fillna('').to_numpy(),
+        'stop_loss': None,
+        'take_profit': None
+    })
 
     print(f"\n✅ Reconstruction complete:")
-    print(f"  Trades created: {len(trades)}")
+    print(f"  Trades created: {len(trades_df)}")
     print(f"  Skipped (NaN position_id): {skipped_nan}")
     print(f"  Skipped (no entry deal): {skipped_no_entry}")
 
-    trades_df = pd.DataFrame(trades)
-
     if not trades_df.empty:
         trades_df = trades_df.sort_values(['symbol', 'entry_time'])
 
@@ -290,16 +273,18 @@ def generate_comprehensive_report(trades_df):
     print(f"Unique Symbols: {trades_df['symbol'].nunique()}")
     print(f"Date Range: {trades_df['entry_time'].min()} to {trades_df['entry_time'].max()}")
     print(f"Total Volume: {trades_df['volume'].sum():.2f} lots")
-    print(f"Buy Trades: {(trades_df['trade_type'] == 'buy').sum()}")
-    print(f"Sell Trades: {(trades_df['trade_type'] == 'sell').sum()}")
+    type_counts = trades_df['trade_type'].value_counts()
+    print(f"Buy Trades: {type_counts.get('buy', 0)}")
+    print(f"Sell Trades: {type_counts.get('sell', 0)}")
 
     # Profit analysis
-    closed_trades = trades_df[trades_df['exit_time'].notna()]
-    if len(closed_trades) > 0:
-        print(f"\nClosed Trades: {len(closed_trades)}")
-        print(f"Total Profit: ${closed_trades['profit'].sum():.2f}")
-        print(f"Win Rate: {(closed_trades['profit'] > 0).sum() / len(closed_trades) * 100:.1f}%")
-        print(f"Avg Profit per Trade: ${closed_trades['profit'].mean():.2f}")
+    closed_profit = trades_df['profit'].to_numpy()[trades_df['exit_time'].notna().to_numpy()]
+    if len(closed_profit) > 0:
+        wins = np.count_nonzero(closed_profit > 0)
+        print(f"\nClosed Trades: {len(closed_profit)}")
+        print(f"Total Profit: ${closed_profit.sum():.2f}")
+        print(f"Win Rate: {wins / len(closed_profit) * 100:.1f}%")
+        print(f"Avg Profit per Trade: ${closed_profit.mean():.2f}")
     print()
 
     # Detect patterns
@@ -371,17 +356,30 @@ def generate_comprehensive_report(trades_df):
     print("SUMMARY BY SYMBOL")
     print("="*80)
 
-    for symbol in sorted(trades_df['symbol'].unique()):
-        sym_trades = trades_df[trades_df['symbol'] == symbol]
-        sym_closed = sym_trades[sym_trades['exit_time'].notna()]
-
-        print(f"\n{symbol}:")
-        print(f"  Total Trades: {len(sym_trades)}")
-        print(f"  Buy: {(sym_trades['trade_type'] == 'buy').sum()} | Sell: {(sym_trades['trade_type'] == 'sell').sum()}")
-
-        if len(sym_closed) > 0:
-            print(f"  Closed: {len(sym_closed)} | Profit: ${sym_closed['profit'].sum():.2f}")
-            print(f"  Win Rate: {(sym_closed['profit'] > 0).sum() / len(sym_closed) * 100:.1f}%")
+    is_closed = trades_df['exit_time'].notna()
+    symbol_summary = trades_df.assign(
+        is_buy=trades_df['trade_type'] == 'buy',
+        is_sell=trades_df['trade_type'] == 'sell',
+        is_closed=is_closed,
+        closed_profit=trades_df['profit'].where(is_closed, 0.0),
+        is_closed_win=is_closed & (trades_df['profit'] > 0),
+    ).groupby('symbol', observed=True, sort=True).agg(
+        trades=('is_closed', 'size'),
+        buys=('is_buy', 'sum'),
+        sells=('is_sell', 'sum'),
+        closed=('is_closed', 'sum'),
+        profit=('closed_profit', 'sum'),
+        wins=('is_closed_win', 'sum'),
+    )
+
+    for sym in symbol_summary.itertuples():
+        print(f"\n{sym.Index}:")
+        print(f"  Total Trades: {sym.trades}")
+        print(f"  Buy: {sym.buys} | Sell: {sym.sells}")
+
+        if sym.closed > 0:
+            print(f"  Closed: {sym.closed} | Profit: ${sym.profit:.2f}")
+            print(f"  Win Rate: {sym.wins / sym.closed * 100:.1f}%")
 
     # Export detailed CSV
     print("\n" + "="*80)
@@ -10,6 +10,13 @@ from collections import defaultdict
 import json
 from pathlib import Path
 
+# Try to import pyarrow for the multithreaded CSV parser
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 def load_htf_data(htf_json_file='multi_timeframe_analysis.json'):
     """
@@ -179,7 +186,10 @@ def analyze_confluence_zones(trades_data_csv='ea_reverse_engineering_detailed.cs
     """
 
     try:
-        df = pd.read_csv(trades_data_csv)
+        if PYARROW_AVAILABLE:
+            df = pd.read_csv(trades_data_csv, engine='pyarrow')
+        else:
+            df = pd.read_csv(trades_data_csv)
     except FileNotFoundError:
         print(f"❌ File not found: {trades_data_csv}")
         print("   Run 'python reverse_engineer_ea.py' first to generate the data")
@@ -13,9 +13,60 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import json
 
+# Try to import numba for the compiled sequence scan
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Column types for the deal columns read from historical_deals
+DEAL_DTYPES = {
+    'symbol': 'category',
+    'volume': 'float64',
+    'price': 'float64',
+    'profit': 'float64',
+    'commission': 'float64',
+    'swap': 'float64',
+    'magic': 'Int64',
+}
+
+
+def chain_window_starts(window_end):
+    """Walk the greedy window chain: each window starts where the previous one ended"""
+    starts = np.empty(window_end.size, dtype=np.int64)
+    count = 0
+    i = 0
+    while i < window_end.size:
+        starts[count] = i
+        count += 1
+        i = window_end[i]
+    return starts[:count]
+
+
+if NUMBA_AVAILABLE:
+    chain_window_starts = numba.njit(cache=True)(chain_window_starts)
+
+
+def pips_per_price_unit(symbol):
+    """Pips per 1.0 of price: JPY pairs quote to 2-3 decimals, others to 4-5"""
+    return 100.0 if 'JPY' in str(symbol) else 10000.0
+
+
+def top_n_indices(values, n=5):
+    """Indices of the n largest values, largest first, ties in original order"""
+    values = np.asarray(values, dtype=float)
+    if len(values) > n:
+        # Linear-time selection of the n-th largest value, keeping every candidate tied with it
+        nth_largest = -np.partition(-values, n - 1)[n - 1]
+        idx = np.flatnonzero(values >= nth_largest)
+    else:
+        idx = np.arange(len(values))
+    return idx[np.lexsort((idx, -values[idx]))][:n]
+
 
 def load_trades_from_db(db_path='data/trading_data.db'):
     """Load all trades from database"""
@@ -31,70 +82,59 @@ def load_trades_from_db(db_path='data/trading_data.db'):
         # Load deals and reconstruct trades
         query = """
         SELECT
-            ticket, [order], position_id, time, type, entry,
+            position_id, time, type, entry,
             symbol, volume, price, profit, commission, swap,
             magic, comment
         FROM historical_deals
         ORDER BY position_id, time
         """
 
-        deals_df = pd.read_sql_query(query, conn)
+        deals_df = pd.read_sql_query(query, conn, dtype=DEAL_DTYPES)
         conn.close()
 
         if deals_df.empty:
             print("❌ No deals found in database")
             return pd.DataFrame()
 
-        deals_df['time'] = pd.to_datetime(deals_df['time'])
-        trades = []
-
-        for position_id in deals_df['position_id'].unique():
-            if pd.isna(position_id):
-                continue
-
-            position_deals = deals_df[deals_df['position_id'] == position_id].sort_values('time')
-
-            # Get entry deal
-            entry_deals = position_deals[position_deals['entry'].isin([0, 2])]
-            if entry_deals.empty:
-                continue
-
-            entry_deal = entry_deals.iloc[0]
-
-            # Get exit deal
-            exit_deals = position_deals[position_deals['entry'].isin([1, 2, 3])]
-            exit_deal = exit_deals.iloc[-1] if not exit_deals.empty else None
-
-            trade_type = 'buy' if entry_deal['type'] == 0 else 'sell'
-
-            # Calculate totals
-            position_profit = position_deals['profit'].sum()
-            position_commission = position_deals['commission'].sum()
-            position_swap = position_deals['swap'].sum()
-
-            trade = {
-                'ticket': int(position_id),
-                'position_id': int(position_id),
-                'symbol': entry_deal['symbol'],
-                'trade_type': trade_type,
-                'entry_time': entry_deal['time'],
-                'entry_price': float(entry_deal['price']),
-                'volume': float(entry_deal['volume']),
-                'exit_time': exit_deal['time'] if exit_deal is not None else None,
-                'exit_price': float(exit_deal['price']) if exit_deal is not None else None,
-                'profit': float(position_profit),
-                'commission': float(position_commission),
-                'swap': float(position_swap),
-                'magic_number': int(entry_deal['magic']) if pd.notna(entry_deal['magic']) else None,
-                'comment': entry_deal['comment'] if pd.notna(entry_deal['comment']) else '',
-            }
-
-            trades.append(trade)
-
-        trades_df = pd.DataFrame(trades)
+        # Deal times are stored as ISO 8601 text; naming the format keeps parsing on the fast path
+        deals_df['time'] = pd.to_datetime(deals_df['time'], format='ISO8601')
+        deals_df = deals_df[deals_df['position_id'].notna()]
+
+        # Entry deal = first opening deal, exit deal = last closing deal per position
+        entry_deals = deals_df[deals_df['entry'].isin([0, 2])].drop_duplicates('position_id', keep='first')
+        entry_deals = entry_deals.set_index('position_id')
+        exit_deals = deals_df[deals_df['entry'].isin([1, 2, 3])].drop_duplicates('position_id', keep='last')
+        exit_deals = exit_deals.set_index('position_id').reindex(entry_deals.index)
+
+        # Calculate totals
+        totals = deals_df.groupby('position_id')[['profit', 'commission', 'swap']].sum()
+        totals = totals.reindex(entry_deals.index)
+
+        position_ids = entry_deals.index.to_numpy(dtype=np.int64)
+        trades_df = pd.DataFrame({
+            'ticket': position_ids,
+            'position_id': position_ids,
+            'symbol': entry_deals['symbol'].cat.remove_unused_categories().array,
+            'trade_type': pd.Categorical.from_codes(
+                (entry_deals['type'].to_numpy() != 0).astype(np.int8), categories=['buy', 'sell']
+            ),
+            'entry_time': entry_deals['time'].to_numpy(),
+            'entry_price': entry_deals['price'].to_numpy(dtype=float),
+            'volume': entry_deals['volume'].to_numpy(dtype=float),
+            'exit_time': exit_deals['time'].to_numpy(),
+            'exit_price': exit_deals['price'].to_numpy(dtype=float),
+            'profit': totals['profit'].to_numpy(dtype=float),
+            'commission': totals['commission'].to_numpy(dtype=float),
+            'swap': totals['swap'].to_numpy(dtype=float),
+            'magic_number': entry_deals['magic'].array,
+            'comment': entry_deals['comment'].fillna('').to_numpy(),
+        })
 
         if not trades_df.empty:
-            trades_df = trades_df.sort_values(['symbol', 'entry_time'])
+            # Order by symbol then entry time, sorting on the integer category codes and epoch values
+            order = np.lexsort((trades_df['entry_time'].to_numpy().view(np.int64),
+                                trades_df['symbol'].cat.codes.to_numpy()))
+            trades_df = trades_df.take(order)
 
         print(f"✅ Loaded {len(trades_df)} trades")
         return trades_df
@@ -108,19 +148,18 @@ def detect_grid_sequences(trades_df):
     """Detect grid trading sequences"""
     grid_sequences = []
 
-    for symbol in trades_df['symbol'].unique():
-        symbol_trades = trades_df[trades_df['symbol'] == symbol].copy()
-        symbol_trades = symbol_trades.sort_values('entry_time')
+    for symbol, symbol_trades in trades_df.groupby('symbol', sort=False, observed=True):
+        symbol_trades = symbol_trades.sort_values('entry_time').to_dict('records')
 
         i = 0
         while i < len(symbol_trades):
-            current = symbol_trades.iloc[i]
+            current = symbol_trades[i]
             grid_trades = [current]
 
             # Look for consecutive same-direction trades
             j = i + 1
             while j < len(symbol_trades):
-                next_trade = symbol_trades.iloc[j]
+                next_trade = symbol_trades[j]
                 time_diff = (next_trade['entry_time'] - current['entry_time']).total_seconds() / 3600
 
                 if (next_trade['trade_type'] == current['trade_type'] and time_diff < 48):
@@ -170,29 +209,32 @@ def detect_hedge_pairs(trades_df):
     """Detect hedging patterns"""
     hedge_pairs = []
 
-    for symbol in trades_df['symbol'].unique():
-        symbol_trades = trades_df[trades_df['symbol'] == symbol].copy()
-        symbol_trades = symbol_trades.sort_values('entry_time')
+    for symbol, symbol_trades in trades_df.groupby('symbol', sort=False, observed=True):
+        symbol_trades = symbol_trades.sort_values('entry_time').to_dict('records')
+        pip_factor = pips_per_price_unit(symbol)
 
         for i in range(len(symbol_trades)):
+            trade1 = symbol_trades[i]
             for j in range(i + 1, len(symbol_trades)):
-                trade1 = symbol_trades.iloc[i]
-                trade2 = symbol_trades.iloc[j]
+                trade2 = symbol_trades[j]
 
                 time_diff_minutes = (trade2['entry_time'] - trade1['entry_time']).total_seconds() / 60
 
+                # Trades are time-ordered, so no later trade can fall within the window
+                if time_diff_minutes >= 60:
+                    break
+
                 # Hedge if opposite directions within 60 minutes
                 if (trade1['trade_type'] != trade2['trade_type'] and
-                    time_diff_minutes < 60 and
                     abs(trade1['entry_price'] - trade2['entry_price']) < trade1['entry_price'] * 0.01):
 
                     volume_ratio = trade2['volume'] / trade1['volume'] if trade1['volume'] > 0 else 0
 
                     # Calculate underwater amount at time of hedge
                     if trade1['trade_type'] == 'buy':
-                        underwater_pips = (trade1['entry_price'] - trade2['entry_price']) * 10000
+                        underwater_pips = (trade1['entry_price'] - trade2['entry_price']) * pip_factor
                     else:
-                        underwater_pips = (trade2['entry_price'] - trade1['entry_price']) * 10000
+                        underwater_pips = (trade2['entry_price'] - trade1['entry_price']) * pip_factor
 
                     combined_profit = trade1.get('profit', 0) + trade2.get('profit', 0)
 
@@ -216,69 +258,79 @@ def detect_hedge_pairs(trades_df):
 def detect_dca_sequences(trades_df):
     """Detect DCA/Martingale sequences"""
     dca_sequences = []
-
-    for symbol in trades_df['symbol'].unique():
-        symbol_trades = trades_df[trades_df['symbol'] == symbol].copy()
-        symbol_trades = symbol_trades.sort_values('entry_time')
-
-        i = 0
-        while i < len(symbol_trades):
-            current = symbol_trades.iloc[i]
-            dca_trades = [current]
-
-            j = i + 1
-            while j < len(symbol_trades):
-                next_trade = symbol_trades.iloc[j]
-                time_diff = (next_trade['entry_time'] - current['entry_time']).total_seconds() / 3600
-
-                if (next_trade['trade_type'] == current['trade_type'] and time_diff < 48):
-                    # Check if adding to losing position
-                    if current['trade_type'] == 'buy':
-                        is_worse = next_trade['entry_price'] < current['entry_price']
-                    else:
-                        is_worse = next_trade['entry_price'] > current['entry_price']
-
-                    if is_worse:
-                        dca_trades.append(next_trade)
-                    j += 1
-                else:
-                    break
-
-            if len(dca_trades) >= 2:
-                volumes = [t['volume'] for t in dca_trades]
-                lot_multipliers = [volumes[k+1] / volumes[k] if volumes[k] > 0 else 1
-                                  for k in range(len(volumes)-1)]
-                avg_multiplier = np.mean(lot_multipliers) if lot_multipliers else 1
-
-                prices = [t['entry_price'] for t in dca_trades]
-                price_decline = abs(prices[-1] - prices[0])
-
-                total_profit = sum(t.get('profit', 0) for t in dca_trades)
-
-                # Calculate max drawdown
-                max_volume = max(volumes)
-                avg_entry = np.average(prices, weights=volumes)
-
-                duration = (dca_trades[-1]['entry_time'] - dca_trades[0]['entry_time']).total_seconds() / 3600
-
-                dca_sequences.append({
-                    'type': 'DCA',
-                    'symbol': symbol,
-                    'direction': current['trade_type'],
-                    'trades': dca_trades,
-                    'count': len(dca_trades),
-                    'avg_lot_multiplier': avg_multiplier,
-                    'max_volume': max_volume,
-                    'total_volume': sum(volumes),
-                    'avg_entry_price': avg_entry,
-                    'price_decline': price_decline,
-                    'price_decline_pips': price_decline * 10000,
-                    'total_profit': total_profit,
-                    'is_successful': total_profit > 0,
-                    'duration_hours': duration,
-                })
-
-            i = j if j > i + 1 else i + 1
+    window = np.timedelta64(48, 'h')
+
+    for symbol, symbol_trades in trades_df.groupby('symbol', sort=False, observed=True):
+        symbol_trades = symbol_trades.sort_values('entry_time', kind='stable')
+
+        times = symbol_trades['entry_time'].to_numpy()
+        is_buy = (symbol_trades['trade_type'] == 'buy').to_numpy()
+        prices = symbol_trades['entry_price'].to_numpy(dtype=float)
+        volumes = symbol_trades['volume'].to_numpy(dtype=float)
+        profits = symbol_trades['profit'].to_numpy(dtype=float)
+        n = len(symbol_trades)
+
+        # A sequence window runs from its first trade until the direction flips
+        # or 48h have passed since that first trade
+        direction_change = np.flatnonzero(is_buy[1:] != is_buy[:-1]) + 1
+        run_end = np.append(direction_change, n)[np.searchsorted(direction_change, np.arange(n), side='right')]
+        window_end = np.minimum(run_end, np.searchsorted(times, times + window, side='left'))
+
+        starts = chain_window_starts(window_end)
+
+        # Trades within a window that add to the first trade at a worse price
+        window_id = np.zeros(n, dtype=np.int64)
+        window_id[starts[1:]] = 1
+        window_id = np.cumsum(window_id)
+        anchor = starts[window_id]
+        is_worse = np.where(is_buy[anchor], prices < prices[anchor], prices > prices[anchor])
+        is_member = is_worse | (np.arange(n) == anchor)
+
+        # Keep members of windows with at least two trades; each such window is one sequence
+        member_idx = np.flatnonzero(is_member)
+        member_window = window_id[member_idx]
+        in_sequence = np.bincount(member_window, minlength=len(starts))[member_window] >= 2
+        idx = member_idx[in_sequence]
+        if idx.size == 0:
+            continue
+        seq_window = member_window[in_sequence]
+        first = np.flatnonzero(np.r_[True, seq_window[1:] != seq_window[:-1]])
+        last = np.r_[first[1:], idx.size] - 1
+        levels = last - first + 1
+
+        # Per-sequence reductions over the concatenated member rows
+        seq_volumes = volumes[idx]
+        seq_prices = prices[idx]
+        lot_ratios = np.ones(idx.size)
+        np.divide(seq_volumes[1:], seq_volumes[:-1], out=lot_ratios[:-1], where=seq_volumes[:-1] > 0)
+        lot_ratios[last] = 0
+        avg_multipliers = np.add.reduceat(lot_ratios, first) / (levels - 1)
+
+        total_profits = np.add.reduceat(profits[idx], first)
+        total_volumes = np.add.reduceat(seq_volumes, first)
+        max_volumes = np.maximum.reduceat(seq_volumes, first)
+        avg_entries = np.add.reduceat(seq_prices * seq_volumes, first) / total_volumes
+        price_declines = np.abs(seq_prices[last] - seq_prices[first])
+        decline_pips = price_declines * pips_per_price_unit(symbol)
+        durations = (times[idx[last]] - times[idx[first]]) / np.timedelta64(1, 'h')
+
+        for k in range(len(first)):
+            dca_sequences.append({
+                'type': 'DCA',
+                'symbol': symbol,
+                'direction': 'buy' if is_buy[idx[first[k]]] else 'sell',
+                'trades': symbol_trades.iloc[idx[first[k]:last[k] + 1]],
+                'count': int(levels[k]),
+                'avg_lot_multiplier': avg_multipliers[k],
+                'max_volume': max_volumes[k],
+                'total_volume': total_volumes[k],
+                'avg_entry_price': avg_entries[k],
+                'price_decline': price_declines[k],
+                'price_decline_pips': decline_pips[k],
+                'total_profit': total_profits[k],
+                'is_successful': total_profits[k] > 0,
+                'duration_hours': durations[k],
+            })
 
     return dca_sequences
 
@@ -434,7 +486,7 @@ def main():
 
         # Show top 5 most profitable grids
         print(f"\nTop 5 Most Profitable Grids:")
-        sorted_grids = sorted(grid_sequences, key=lambda x: x['total_profit'], reverse=True)[:5]
+        sorted_grids = [grid_sequences[i] for i in top_n_indices([g['total_profit'] for g in grid_sequences])]
         for idx, grid in enumerate(sorted_grids, 1):
             print(f"  {idx}. {grid['count']} trades, {grid['symbol']}, "
                   f"${grid['total_profit']:.2f}, "
@@ -479,7 +531,7 @@ def main():
 
         # Show most extreme hedges
         print(f"\nMost Extreme Hedge Scenarios:")
-        sorted_hedges = sorted(hedge_pairs, key=lambda x: x['underwater_pips'], reverse=True)[:5]
+        sorted_hedges = [hedge_pairs[i] for i in top_n_indices([h['underwater_pips'] for h in hedge_pairs])]
         for idx, hedge in enumerate(sorted_hedges, 1):
             print(f"  {idx}. {hedge['symbol']}, "
                   f"{hedge['underwater_pips']:.1f} pips underwater, "
@@ -495,17 +547,21 @@ def main():
     print("=" * 80)
 
     if dca_sequences:
-        successful_dca = [d for d in dca_sequences if d['is_successful']]
+        dca_df = pd.DataFrame(dca_sequences, columns=[
+            'symbol', 'count', 'avg_lot_multiplier', 'price_decline_pips',
+            'total_profit', 'is_successful', 'duration_hours'
+        ])
+        successful_dca = int(dca_df['is_successful'].sum())
 
-        print(f"\nTotal DCA Sequences: {len(dca_sequences)}")
-        print(f"Successful: {len(successful_dca)} ({len(successful_dca)/len(dca_sequences)*100:.1f}%)")
+        print(f"\nTotal DCA Sequences: {len(dca_df)}")
+        print(f"Successful: {successful_dca} ({successful_dca/len(dca_df)*100:.1f}%)")
 
         print(f"\nDCA Statistics:")
-        avg_levels = np.mean([d['count'] for d in dca_sequences])
-        avg_multiplier = np.mean([d['avg_lot_multiplier'] for d in dca_sequences])
-        avg_decline = np.mean([d['price_decline_pips'] for d in dca_sequences])
-        avg_profit = np.mean([d['total_profit'] for d in dca_sequences])
-        avg_duration = np.mean([d['duration_hours'] for d in dca_sequences])
+        avg_levels = dca_df['count'].mean()
+        avg_multiplier = dca_df['avg_lot_multiplier'].mean()
+        avg_decline = dca_df['price_decline_pips'].mean()
+        avg_profit = dca_df['total_profit'].mean()
+        avg_duration = dca_df['duration_hours'].mean()
 
         print(f"  Avg DCA levels: {avg_levels:.1f}")
         print(f"  Avg lot multiplier: {avg_multiplier:.2f}x")
@@ -515,24 +571,25 @@ def main():
 
         # Success rate by number of levels
         print(f"\nSuccess Rate by DCA Depth:")
-        for level in range(2, 8):
-            level_sequences = [d for d in dca_sequences if d['count'] == level]
-            if level_sequences:
-                successful = len([d for d in level_sequences if d['is_successful']])
-                success_rate = (successful / len(level_sequences)) * 100
-                avg_profit_level = np.mean([d['total_profit'] for d in level_sequences])
-                print(f"  {level} levels: {success_rate:.1f}% success rate "
-                      f"({successful}/{len(level_sequences)}), "
-                      f"Avg P/L: ${avg_profit_level:.2f}")
+        dca_by_depth = dca_df.groupby('count').agg(
+            sequences=('is_successful', 'size'),
+            successful=('is_successful', 'sum'),
+            avg_profit=('total_profit', 'mean'),
+        )
+        dca_by_depth['success_rate'] = dca_by_depth['successful'] / dca_by_depth['sequences'] * 100
+        for depth in dca_by_depth.loc[2:7].itertuples():
+            print(f"  {depth.Index} levels: {depth.success_rate:.1f}% success rate "
+                  f"({depth.successful}/{depth.sequences}), "
+                  f"Avg P/L: ${depth.avg_profit:.2f}")
 
         # Show worst DCA scenarios
         print(f"\nWorst DCA Scenarios:")
-        sorted_dca = sorted(dca_sequences, key=lambda x: x['total_profit'])[:5]
-        for idx, dca in enumerate(sorted_dca, 1):
-            print(f"  {idx}. {dca['count']} levels, {dca['symbol']}, "
-                  f"{dca['price_decline_pips']:.1f} pips decline, "
-                  f"${dca['total_profit']:.2f}, "
-                  f"{dca['duration_hours']:.1f}h duration")
+        worst_dca = dca_df.nsmallest(5, 'total_profit')
+        for idx, dca in enumerate(worst_dca.itertuples(), 1):
+            print(f"  {idx}. {dca.count} levels, {dca.symbol}, "
+                  f"{dca.price_decline_pips:.1f} pips decline, "
+                  f"${dca.total_profit:.2f}, "
+                  f"{dca.duration_hours:.1f}h duration")
 
     else:
         print("\n⚠️  No DCA sequences detected")
@@ -618,9 +675,8 @@ def main():
         print(f"Successful: {successful} ({successful/len(combined_strategies)*100:.1f}%)")
 
         print(f"\nTop Combined Strategies:")
-        sorted_combined = sorted(combined_strategies,
-                                key=lambda x: x['combined_profit'],
-                                reverse=True)[:5]
+        sorted_combined = [combined_strategies[i] for i in
+                           top_n_indices([c['combined_profit'] for c in combined_strategies])]
         for idx, combo in enumerate(sorted_combined, 1):
             print(f"  {idx}. {combo['grid']['count']} grid trades + hedge, "
                   f"${combo['combined_profit']:.2f}")
@@ -632,7 +688,7 @@ def main():
 
     print("\n1. Grid Trading:")
     if grid_sequences:
-        successful_pct = len([g for g in grid_sequences if g['is_successful']]) / len(grid_sequences) * 100
+        successful_pct = len(successful_grids) / len(grid_sequences) * 100
         if successful_pct > 60:
             print(f"   ✅ Grid strategy is working ({successful_pct:.1f}% success)")
             print(f"   → Maintain current grid spacing: ~{avg_spacing*10000:.1f} pips")
@@ -642,7 +698,7 @@ def main():
 
     print("\n2. Hedging:")
     if hedge_pairs:
-        successful_pct = len([h for h in hedge_pairs if h['is_successful']]) / len(hedge_pairs) * 100
+        successful_pct = len(successful_hedges) / len(hedge_pairs) * 100
         print(f"   Current success rate: {successful_pct:.1f}%")
         print(f"   Avg trigger point: {avg_underwater:.1f} pips underwater")
         if avg_ratio > 2.0:
@@ -653,16 +709,14 @@ def main():
 
     print("\n3. DCA/Martingale:")
     if dca_sequences:
-        # Find optimal depth
+        # Find optimal depth among depths with enough sequences
         best_depth = None
         best_rate = 0
-        for level in range(2, 8):
-            level_sequences = [d for d in dca_sequences if d['count'] == level]
-            if len(level_sequences) >= 3:
-                success_rate = len([d for d in level_sequences if d['is_successful']]) / len(level_sequences) * 100
-                if success_rate > best_rate:
-                    best_rate = success_rate
-                    best_depth = level
+        eligible = dca_by_depth.loc[2:7]
+        eligible = eligible.loc[eligible['sequences'] >= 3, 'success_rate']
+        if not eligible.empty and eligible.max() > 0:
+            best_depth = eligible.idxmax()
+            best_rate = eligible[best_depth]
 
         if best_depth:
             print(f"   → Optimal DCA depth: {best_depth} levels ({best_rate:.1f}% success)")
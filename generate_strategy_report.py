@@ -4,16 +4,144 @@ EA Strategy Report Generator
 Creates a concise TLDR report of what the EA does and how to implement it
 """
 
+import ast
+import os
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import json
 from datetime import datetime
-from collections import defaultdict
+from functools import partial
+from hashlib import blake2b
+from io import StringIO
+from itertools import chain
+from collections import Counter, defaultdict
+
+# Try to import pyarrow for the multithreaded CSV parser
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Try to import orjson for fast report serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import numexpr for fused reductions without numba
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# Try to import numba for the compiled aggregation kernels
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Below these many rows the NumPy reductions beat the JIT / NumExpr call overhead
+JIT_MIN_SIZE = 10_000
+NUMEXPR_MIN_SIZE = 50_000
+
+# Entry signal flag columns and their report descriptions
+SIGNAL_COLUMNS = {
+    'in_vwap_band_1': 'VWAP Band 1 (±1σ)',
+    'in_vwap_band_2': 'VWAP Band 2 (±2σ)',
+    'at_swing_high': 'Swing High',
+    'at_swing_low': 'Swing Low',
+    'at_poc': 'POC (Point of Control)',
+    'above_vah': 'Above Value Area High',
+    'below_val': 'Below Value Area Low',
+    'at_lvn': 'Low Volume Node',
+}
+SIGNAL_KEYS = np.array(list(SIGNAL_COLUMNS.keys()))
+SIGNAL_DESCRIPTIONS = np.array(list(SIGNAL_COLUMNS.values()))
+
+
+def read_analysis_csv(path, dtype=None):
+    """Read an analysis CSV, using the PyArrow engine when available"""
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(path, dtype=dtype, engine='pyarrow', dtype_backend='pyarrow')
+    return pd.read_csv(path, dtype=dtype)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _score_stats_jit(scores, profits, k):
+        """Single pass score -> (count, wins, profit sum) over k score buckets"""
+        count = np.zeros(k, np.int64)
+        wins = np.zeros(k, np.int64)
+        profit_sum = np.zeros(k, np.float64)
+        for i in range(scores.size):
+            s = scores[i]
+            p = profits[i]
+            count[s] += 1
+            if p > 0:
+                wins[s] += 1
+            profit_sum[s] += p
+        return count, wins, profit_sum
+
+    @numba.njit(cache=True)
+    def _profit_stats_jit(profits):
+        """Single pass (count, wins, profit sum) over the non-NaN profits"""
+        count = 0
+        wins = 0
+        profit_sum = 0.0
+        for i in range(profits.size):
+            p = profits[i]
+            if p == p:
+                count += 1
+                profit_sum += p
+                if p > 0:
+                    wins += 1
+        return count, wins, profit_sum
+
+
+def score_stats(scores, profits, k):
+    """Score -> (count, wins, profit sum) over k score buckets"""
+    if NUMBA_AVAILABLE and scores.size > JIT_MIN_SIZE:
+        return _score_stats_jit(scores, profits, k)
+    count = np.bincount(scores, minlength=k)
+    wins = np.bincount(scores[profits > 0], minlength=k)
+    profit_sum = np.bincount(scores, weights=profits, minlength=k)
+    return count, wins, profit_sum
+
+
+def profit_stats(profits):
+    """(count, wins, profit sum) over the non-NaN entries of a profit array"""
+    if NUMBA_AVAILABLE and profits.size > JIT_MIN_SIZE:
+        return _profit_stats_jit(profits)
+    if NUMEXPR_AVAILABLE and profits.size > NUMEXPR_MIN_SIZE:
+        local_dict = {'p': profits}
+        return (
+            int(ne.evaluate('sum(where(p == p, 1, 0))', local_dict=local_dict)),
+            int(ne.evaluate('sum(where(p > 0, 1, 0))', local_dict=local_dict)),
+            float(ne.evaluate('sum(where(p == p, p, 0))', local_dict=local_dict))
+        )
+    valid = profits[~np.isnan(profits)]
+    return valid.size, np.count_nonzero(valid > 0), valid.sum()
+
+
+def most_common_factors(factors, n):
+    """Top-n (factor, count) pairs across a column of stringified factor lists"""
+    factors = factors.dropna().astype(str)
+
+    # The column holds Python list reprs, so parse them the way they were written
+    factor_counts = Counter()
+    for factors_str in factors:
+        factor_counts.update(ast.literal_eval(factors_str))
+    return factor_counts.most_common(n)
+
 
 def load_analysis_data():
     """Load all analysis data files"""
@@ -24,21 +152,28 @@ def load_analysis_data():
         'recovery': None
     }
 
+    # One directory scan instead of a stat() per file
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries if entry.is_file()}
+
     # Load trade analysis
-    if Path('ea_reverse_engineering_detailed.csv').exists():
-        data['trades'] = pd.read_csv('ea_reverse_engineering_detailed.csv')
+    if 'ea_reverse_engineering_detailed.csv' in present:
+        data['trades'] = read_analysis_csv(
+            'ea_reverse_engineering_detailed.csv',
+            dtype={'symbol': 'category'}
+        )
 
     # Load confluence analysis
-    if Path('confluence_zones_detailed.csv').exists():
-        data['confluence'] = pd.read_csv('confluence_zones_detailed.csv')
+    if 'confluence_zones_detailed.csv' in present:
+        data['confluence'] = read_analysis_csv('confluence_zones_detailed.csv')
 
     # Load HTF multi-timeframe analysis
-    if Path('multi_timeframe_analysis.json').exists():
+    if 'multi_timeframe_analysis.json' in present:
         with open('multi_timeframe_analysis.json', 'r') as f:
             data['htf'] = json.load(f)
 
     # Load recovery strategy analysis
-    if Path('recovery_strategy_analysis.json').exists():
+    if 'recovery_strategy_analysis.json' in present:
         with open('recovery_strategy_analysis.json', 'r') as f:
             data['recovery'] = json.load(f)
 
@@ -60,36 +195,36 @@ def analyze_core_strategy(trades_df):
     }
 
     # Calculate performance
-    closed_trades = trades_df[trades_df['exit_time'].notna()]
-    if len(closed_trades) > 0:
-        strategy['win_rate'] = (closed_trades['profit'] > 0).sum() / len(closed_trades) * 100
-        strategy['avg_profit'] = closed_trades['profit'].mean()
+    closed = trades_df['exit_time'].notna().to_numpy()
+    if closed.any():
+        closed_profit = trades_df['profit'].to_numpy(dtype=np.float64, na_value=np.nan)[closed]
+        count, wins, profit_sum = profit_stats(closed_profit)
+        strategy['win_rate'] = wins / closed_profit.size * 100
+        strategy['avg_profit'] = profit_sum / count if count else np.nan
 
     # Identify primary entry signals
-    signal_columns = {
-        'in_vwap_band_1': 'VWAP Band 1 (±1σ)',
-        'in_vwap_band_2': 'VWAP Band 2 (±2σ)',
-        'at_swing_high': 'Swing High',
-        'at_swing_low': 'Swing Low',
-        'at_poc': 'POC (Point of Control)',
-        'above_vah': 'Above Value Area High',
-        'below_val': 'Below Value Area Low',
-        'at_lvn': 'Low Volume Node',
-    }
-
-    for col, description in signal_columns.items():
-        if col in trades_df.columns:
-            usage = trades_df[col].sum()
-            if usage > len(trades_df) * 0.1:  # Used in >10% of trades
-                strategy['primary_signals'].append({
-                    'signal': description,
-                    'usage_pct': (usage / len(trades_df)) * 100,
-                    'count': int(usage)
-                })
+    columns = set(trades_df.columns)
+    present = np.fromiter((key in columns for key in SIGNAL_COLUMNS), dtype=bool, count=len(SIGNAL_COLUMNS))
+    if present.any():
+        # Cast before filling: blank flag cells read back as nulls in bool[pyarrow]
+        # (or all-null) columns, which reject a numeric fill value
+        usage = trades_df[SIGNAL_KEYS[present]].astype('float64').to_numpy(na_value=0.0).sum(axis=0)
+        keep = usage > len(trades_df) * 0.1  # Used in >10% of trades
+        usage_pct = usage / len(trades_df) * 100
+        strategy['primary_signals'] = [
+            {'signal': str(description), 'usage_pct': float(pct), 'count': int(count)}
+            for description, pct, count in zip(
+                SIGNAL_DESCRIPTIONS[present][keep], usage_pct[keep], usage[keep]
+            )
+        ]
 
     # Get symbols
     if 'symbol' in trades_df.columns:
-        strategy['symbols'] = trades_df['symbol'].unique().tolist()
+        symbols = trades_df['symbol']
+        if isinstance(symbols.dtype, pd.CategoricalDtype):
+            strategy['symbols'] = symbols.cat.categories.tolist()
+        else:
+            strategy['symbols'] = symbols.unique().tolist()
 
     return strategy
 
@@ -109,17 +244,19 @@ def analyze_confluence_requirements(confluence_df):
     # Determine optimal score
     if 'confluence_score' in confluence_df.columns:
         # Find score with best win rate
-        scores_with_profit = confluence_df[confluence_df['profit'].notna()]
+        scores_with_profit = confluence_df[['confluence_score', 'profit']].dropna()
         if not scores_with_profit.empty:
+            scores = scores_with_profit['confluence_score'].to_numpy(dtype=np.int64)
+            profits = scores_with_profit['profit'].to_numpy(dtype=np.float64)
+            counts, wins, profit_sums = score_stats(scores, profits, int(scores.max()) + 1)
+
             score_performance = {}
-            for score in scores_with_profit['confluence_score'].unique():
-                score_trades = scores_with_profit[scores_with_profit['confluence_score'] == score]
-                if len(score_trades) >= 5:  # Minimum sample size
-                    win_rate = (score_trades['profit'] > 0).sum() / len(score_trades) * 100
+            for score in pd.unique(scores):
+                if counts[score] >= 5:  # Minimum sample size
                     score_performance[score] = {
-                        'win_rate': win_rate,
-                        'count': len(score_trades),
-                        'avg_profit': score_trades['profit'].mean()
+                        'win_rate': wins[score] / counts[score] * 100,
+                        'count': int(counts[score]),
+                        'avg_profit': profit_sums[score] / counts[score]
                     }
 
             if score_performance:
@@ -133,17 +270,10 @@ def analyze_confluence_requirements(confluence_df):
 
     # Most common factors
     if 'factors' in confluence_df.columns:
-        all_factors = []
-        for factors_str in confluence_df['factors'].dropna():
-            if isinstance(factors_str, str):
-                all_factors.extend(eval(factors_str))
-
-        if all_factors:
-            factor_counts = pd.Series(all_factors).value_counts()
-            confluence['most_common_factors'] = [
-                {'factor': factor, 'count': int(count)}
-                for factor, count in factor_counts.head(5).items()
-            ]
+        confluence['most_common_factors'] = [
+            {'factor': factor, 'count': count}
+            for factor, count in most_common_factors(confluence_df['factors'], 5)
+        ]
 
     return confluence
 
@@ -221,13 +351,11 @@ def analyze_recovery_mechanics(recovery_data):
     return recovery
 
 
-def generate_implementation_code(strategy, confluence, htf, recovery):
-    """Generate Python implementation guidelines"""
-
-    code_sections = []
+# =============================================================================
+# IMPLEMENTATION CODE TEMPLATES
+# =============================================================================
 
-    # 1. Entry Signal Detection
-    code_sections.append("""
+_ENTRY_BLOCK = """
 # =============================================================================
 # ENTRY SIGNAL DETECTION
 # =============================================================================
@@ -253,13 +381,10 @@ def detect_entry_signal(current_data, htf_levels):
     current_price = current_data['close']
     confluence_score = 0
     factors = []
-""")
+"""
+
 
-    # Add VWAP checking
-    if strategy and strategy.get('primary_signals'):
-        vwap_signals = [s for s in strategy['primary_signals'] if 'VWAP' in s['signal']]
-        if vwap_signals:
-            code_sections.append("""
+_VWAP_BLOCK = """
     # Check VWAP bands (PRIMARY SIGNAL)
     vwap = current_data.get('VWAP')
     vwap_std = calculate_vwap_std(current_data)  # You need to implement this
@@ -276,11 +401,10 @@ def detect_entry_signal(current_data, htf_levels):
             confluence_score += 1
             factors.append('VWAP Band 2')
             signal['direction'] = 'buy' if current_price < vwap else 'sell'
-""")
+"""
 
-    # Add HTF checking
-    if htf:
-        code_sections.append("""
+
+_HTF_BLOCK = """
     # Check HTF institutional levels (CRITICAL)
     tolerance = current_price * 0.003  # 0.3% tolerance
 
@@ -307,21 +431,20 @@ def detect_entry_signal(current_data, htf_levels):
     elif prev_low and abs(current_price - prev_low) < tolerance:
         confluence_score += 2
         factors.append('Previous Week Low')
-""")
+"""
 
-    # Add confluence check
-    min_confluence = confluence.get('optimal_score', 4) if confluence else 4
-    code_sections.append(f"""
+
+_DECISION_TMPL = """
     # Decision: Trade only with sufficient confluence
     signal['confluence_score'] = confluence_score
     signal['factors'] = factors
     signal['should_trade'] = confluence_score >= {min_confluence}
 
     return signal if signal['should_trade'] else None
-""")
+"""
 
-    # 2. Position Sizing
-    code_sections.append("""
+
+_POSITION_SIZING_BLOCK = """
 
 # =============================================================================
 # POSITION SIZING
@@ -346,17 +469,16 @@ def calculate_position_size(account_balance, risk_percent=1.0):
     lot_size = max(0.01, min(lot_size, 1.0))
 
     return lot_size
-""")
+"""
 
-    # 3. Recovery Strategy
-    if recovery and recovery.get('uses_grid'):
-        code_sections.append(f"""
+
+_GRID_TMPL = """
 
 # =============================================================================
 # GRID RECOVERY STRATEGY
 # =============================================================================
 
-GRID_SPACING_PIPS = {recovery.get('grid_spacing', 10.8)}  # From EA analysis
+GRID_SPACING_PIPS = {grid_spacing}  # From EA analysis
 MAX_GRID_LEVELS = 6  # Maximum grid positions
 GRID_LOT_SIZE = 0.02  # Fixed lot per level
 
@@ -371,10 +493,10 @@ def should_add_grid_level(entry_price, current_price, existing_levels):
     expected_levels = int(pips_moved / GRID_SPACING_PIPS) + 1
 
     return expected_levels > len(existing_levels)
-""")
+"""
 
-    if recovery and recovery.get('uses_hedge'):
-        code_sections.append(f"""
+
+_HEDGE_BLOCK = """
 
 # =============================================================================
 # HEDGING STRATEGY
@@ -400,16 +522,16 @@ def should_activate_hedge(entry_price, current_price, trade_type, has_hedge):
 def calculate_hedge_size(original_position_size):
     \"\"\"Calculate hedge position size\"\"\"
     return round(original_position_size * HEDGE_RATIO, 2)
-""")
+"""
 
-    if recovery and recovery.get('uses_dca'):
-        code_sections.append(f"""
+
+_DCA_TMPL = """
 
 # =============================================================================
 # DCA / MARTINGALE STRATEGY
 # =============================================================================
 
-MAX_DCA_LEVELS = {recovery.get('dca_optimal_depth', 3)}  # Optimal depth from analysis
+MAX_DCA_LEVELS = {dca_depth}  # Optimal depth from analysis
 MARTINGALE_MULTIPLIER = 1.4  # Lot size multiplier per level
 
 def should_add_dca_level(entry_price, current_price, trade_type, current_level):
@@ -431,10 +553,10 @@ def should_add_dca_level(entry_price, current_price, trade_type, current_level):
 def calculate_dca_lot_size(base_lot_size, level):
     \"\"\"Calculate lot size for DCA level with martingale\"\"\"
     return round(base_lot_size * (MARTINGALE_MULTIPLIER ** level), 2)
-""")
+"""
 
-    # 4. Exit Strategy
-    code_sections.append("""
+
+_EXIT_BLOCK = """
 
 # =============================================================================
 # EXIT STRATEGY
@@ -461,10 +583,10 @@ def should_close_position(entry_price, current_price, trade_type, vwap):
             pips_profit = (entry_price - current_price) * 10000
 
         return pips_profit >= TAKE_PROFIT_PIPS
-""")
+"""
 
-    # 5. Main Trading Loop
-    code_sections.append("""
+
+_MAIN_LOOP_BLOCK = """
 
 # =============================================================================
 # MAIN TRADING LOOP
@@ -535,21 +657,120 @@ def main_trading_loop():
 
 if __name__ == '__main__':
     main_trading_loop()
-""")
+"""
+
+
+IMPLEMENTATION_HEADER = '''#!/usr/bin/env python3
+# cache-key: {cache_key}
+"""
+EA Python Implementation - Generated from Reverse Engineering
+Generated: {generated}
+"""
 
-    return '\n'.join(code_sections)
+import time
+'''
 
+# Everything besides the analysis inputs that shapes the generated file:
+# the code templates, the header, and the generator source that assembles
+# them. Part of the cache key, so editing the generator invalidates files
+# written by an older version even when the analysis is unchanged
+_IMPLEMENTATION_TEMPLATES = (
+    IMPLEMENTATION_HEADER, _ENTRY_BLOCK, _VWAP_BLOCK, _HTF_BLOCK, _DECISION_TMPL,
+    _POSITION_SIZING_BLOCK, _GRID_TMPL, _HEDGE_BLOCK, _DCA_TMPL, _EXIT_BLOCK, _MAIN_LOOP_BLOCK
+)
+
+
+def _generator_digest():
+    """Digest of the implementation templates and this generator's source"""
+    digest = blake2b(digest_size=16)
+    for template in _IMPLEMENTATION_TEMPLATES:
+        digest.update(template.encode('utf-8'))
+    try:
+        digest.update(Path(__file__).read_bytes())
+    except OSError:
+        pass  # Source not on disk (e.g. frozen build) - the templates still count
+    return digest.hexdigest()
+
+
+GENERATOR_DIGEST = _generator_digest()
 
-def generate_report():
-    """Generate comprehensive EA strategy report"""
 
-    print("=" * 80)
-    print("EA STRATEGY REPORT - COMPREHENSIVE TLDR")
-    print("=" * 80)
-    print()
+def iter_implementation_code(strategy, confluence, htf, recovery):
+    """Yield the Python implementation guideline sections, newline separated"""
+    primary_signals = strategy.get('primary_signals') if strategy else None
+    uses_vwap = bool(primary_signals) and any('VWAP' in s['signal'] for s in primary_signals)
+    min_confluence = confluence.get('optimal_score', 4) if confluence else 4
+    recovery = recovery or {}
+
+    substitutions = {
+        'min_confluence': min_confluence,
+        'grid_spacing': recovery.get('grid_spacing', 10.8),
+        'dca_depth': recovery.get('dca_optimal_depth', 3),
+    }
+
+    # (enabled, block, needs formatting)
+    code_sections = [
+        (True, _ENTRY_BLOCK, False),
+        (uses_vwap, _VWAP_BLOCK, False),
+        (bool(htf), _HTF_BLOCK, False),
+        (True, _DECISION_TMPL, True),
+        (True, _POSITION_SIZING_BLOCK, False),
+        (recovery.get('uses_grid'), _GRID_TMPL, True),
+        (recovery.get('uses_hedge'), _HEDGE_BLOCK, False),
+        (recovery.get('uses_dca'), _DCA_TMPL, True),
+        (True, _EXIT_BLOCK, False),
+        (True, _MAIN_LOOP_BLOCK, False),
+    ]
+
+    sections = (
+        block.format_map(substitutions) if templated else block
+        for enabled, block, templated in code_sections if enabled
+    )
+    yield next(sections)
+    for section in sections:
+        yield '\n'
+        yield section
+
+
+def generate_implementation_code(strategy, confluence, htf, recovery):
+    """Generate Python implementation guidelines"""
+    return ''.join(iter_implementation_code(strategy, confluence, htf, recovery))
+
+
+def implementation_cache_key(strategy, confluence, htf, recovery):
+    """Deterministic hash of the inputs and generator version that shape the generated implementation"""
+    inputs = [GENERATOR_DIGEST, strategy, confluence, htf, recovery]
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(
+            inputs,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        )
+    else:
+        payload = json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')
+    return blake2b(payload, digest_size=16).hexdigest()
+
+
+def implementation_is_current(path, cache_key):
+    """Check whether a generated implementation file was built from cache_key"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            f.readline()  # shebang
+            return f.readline().strip() == f'# cache-key: {cache_key}'
+    except OSError:
+        return False
+
+
+def write_report(emit):
+    """Generate comprehensive EA strategy report, passing each line to emit"""
+
+    emit("=" * 80)
+    emit("EA STRATEGY REPORT - COMPREHENSIVE TLDR")
+    emit("=" * 80)
+    emit()
 
     # Load all data
-    print("📥 Loading analysis data...")
+    emit("📥 Loading analysis data...")
     data = load_analysis_data()
 
     # Check if we have at least some data
@@ -564,15 +785,15 @@ def generate_report():
         has_data = True
 
     if not has_data:
-        print("\n❌ No analysis data found!")
-        print("   Please run the following first:")
-        print("   1. Analyze My EA (Option 1)")
-        print("   2. Analyze Confluence Zones (Option 2)")
-        print("   3. Deep Dive: Recovery Strategies (Option 3)")
+        emit("\n❌ No analysis data found!")
+        emit("   Please run the following first:")
+        emit("   1. Analyze My EA (Option 1)")
+        emit("   2. Analyze Confluence Zones (Option 2)")
+        emit("   3. Deep Dive: Recovery Strategies (Option 3)")
         return
 
-    print("✅ Data loaded successfully")
-    print()
+    emit("✅ Data loaded successfully")
+    emit()
 
     # Analyze each component
     strategy = analyze_core_strategy(data['trades'])
@@ -581,83 +802,83 @@ def generate_report():
     recovery = analyze_recovery_mechanics(data['recovery'])
 
     # ========== EXECUTIVE SUMMARY ==========
-    print("=" * 80)
-    print("📋 EXECUTIVE SUMMARY")
-    print("=" * 80)
-    print()
+    emit("=" * 80)
+    emit("📋 EXECUTIVE SUMMARY")
+    emit("=" * 80)
+    emit()
 
     if strategy:
-        print(f"Total Trades Analyzed: {strategy['total_trades']}")
-        print(f"Overall Win Rate: {strategy['win_rate']:.1f}%")
-        print(f"Average Profit per Trade: ${strategy['avg_profit']:.2f}")
-        print(f"Symbols: {', '.join(strategy['symbols'])}")
-        print(f"Primary Timeframe: {strategy['timeframe']}")
-    print()
+        emit(f"Total Trades Analyzed: {strategy['total_trades']}")
+        emit(f"Overall Win Rate: {strategy['win_rate']:.1f}%")
+        emit(f"Average Profit per Trade: ${strategy['avg_profit']:.2f}")
+        emit(f"Symbols: {', '.join(strategy['symbols'])}")
+        emit(f"Primary Timeframe: {strategy['timeframe']}")
+    emit()
 
     # ========== CORE STRATEGY ==========
-    print("=" * 80)
-    print("🎯 WHAT THE EA DOES - CORE STRATEGY")
-    print("=" * 80)
-    print()
+    emit("=" * 80)
+    emit("🎯 WHAT THE EA DOES - CORE STRATEGY")
+    emit("=" * 80)
+    emit()
 
-    print("Entry Methodology:")
-    print("-" * 80)
+    emit("Entry Methodology:")
+    emit("-" * 80)
     if strategy and strategy['primary_signals']:
-        print("The EA enters trades based on confluence of multiple factors:")
-        print()
+        emit("The EA enters trades based on confluence of multiple factors:")
+        emit()
         for signal in strategy['primary_signals']:
-            print(f"  • {signal['signal']}")
-            print(f"    Used in {signal['usage_pct']:.1f}% of trades ({signal['count']} times)")
+            emit(f"  • {signal['signal']}")
+            emit(f"    Used in {signal['usage_pct']:.1f}% of trades ({signal['count']} times)")
     else:
-        print("  Unable to determine entry signals from data")
-    print()
+        emit("  Unable to determine entry signals from data")
+    emit()
 
     if confluence:
-        print(f"Confluence Requirements:")
-        print(f"  • Minimum confluence score: {confluence.get('optimal_score', 'Unknown')}")
+        emit(f"Confluence Requirements:")
+        emit(f"  • Minimum confluence score: {confluence.get('optimal_score', 'Unknown')}")
         if confluence.get('optimal_win_rate'):
-            print(f"  • Win rate at optimal score: {confluence['optimal_win_rate']:.1f}%")
-        print(f"  • High-value setups (3+ factors): {confluence['high_value_zones']}")
-        print()
+            emit(f"  • Win rate at optimal score: {confluence['optimal_win_rate']:.1f}%")
+        emit(f"  • High-value setups (3+ factors): {confluence['high_value_zones']}")
+        emit()
 
         if confluence.get('most_common_factors'):
-            print("Most Important Confluence Factors:")
+            emit("Most Important Confluence Factors:")
             for factor_info in confluence['most_common_factors']:
-                print(f"  • {factor_info['factor']} - appears {factor_info['count']} times")
-    print()
+                emit(f"  • {factor_info['factor']} - appears {factor_info['count']} times")
+    emit()
 
     # ========== HTF ANALYSIS ==========
     if htf:
-        print("=" * 80)
-        print("📊 HIGHER TIMEFRAME INSTITUTIONAL LEVELS")
-        print("=" * 80)
-        print()
+        emit("=" * 80)
+        emit("📊 HIGHER TIMEFRAME INSTITUTIONAL LEVELS")
+        emit("=" * 80)
+        emit()
 
-        print("The EA respects key institutional levels:")
+        emit("The EA respects key institutional levels:")
         if htf.get('daily_poc'):
-            print(f"  • Daily POC: {htf['daily_poc']:.5f}")
+            emit(f"  • Daily POC: {htf['daily_poc']:.5f}")
         if htf.get('weekly_poc'):
-            print(f"  • Weekly POC: {htf['weekly_poc']:.5f}")
+            emit(f"  • Weekly POC: {htf['weekly_poc']:.5f}")
         if htf.get('prev_week_high'):
-            print(f"  • Previous Week High: {htf['prev_week_high']:.5f}")
+            emit(f"  • Previous Week High: {htf['prev_week_high']:.5f}")
         if htf.get('prev_week_low'):
-            print(f"  • Previous Week Low: {htf['prev_week_low']:.5f}")
+            emit(f"  • Previous Week Low: {htf['prev_week_low']:.5f}")
         if htf.get('prev_week_vwap'):
-            print(f"  • Previous Week VWAP: {htf['prev_week_vwap']:.5f}")
-        print()
+            emit(f"  • Previous Week VWAP: {htf['prev_week_vwap']:.5f}")
+        emit()
 
         if htf.get('key_hvn_levels'):
-            print("Key HVN Levels (Strong S/R):")
+            emit("Key HVN Levels (Strong S/R):")
             for i, hvn in enumerate(htf['key_hvn_levels'][:3], 1):
-                print(f"  {i}. {hvn:.5f}")
-        print()
+                emit(f"  {i}. {hvn:.5f}")
+        emit()
 
     # ========== RECOVERY MECHANISMS ==========
     if recovery:
-        print("=" * 80)
-        print("🔧 RECOVERY MECHANISMS")
-        print("=" * 80)
-        print()
+        emit("=" * 80)
+        emit("🔧 RECOVERY MECHANISMS")
+        emit("=" * 80)
+        emit()
 
         mechanisms = []
         if recovery.get('uses_grid'):
@@ -668,39 +889,39 @@ def generate_report():
             mechanisms.append("DCA/Martingale")
 
         if mechanisms:
-            print(f"The EA uses: {', '.join(mechanisms)}")
-            print()
+            emit(f"The EA uses: {', '.join(mechanisms)}")
+            emit()
 
             if recovery.get('uses_grid'):
-                print("Grid Trading:")
+                emit("Grid Trading:")
                 if recovery.get('grid_spacing'):
-                    print(f"  • Spacing: {recovery['grid_spacing']:.1f} pips")
-                print(f"  • Adds positions at regular intervals when underwater")
+                    emit(f"  • Spacing: {recovery['grid_spacing']:.1f} pips")
+                emit(f"  • Adds positions at regular intervals when underwater")
 
             if recovery.get('uses_hedge'):
-                print("\nHedging:")
+                emit("\nHedging:")
                 if recovery.get('hedge_ratio'):
-                    print(f"  • Ratio: {recovery['hedge_ratio']:.1f}x (overhedge)")
-                print(f"  • Triggers when position moves against entry")
+                    emit(f"  • Ratio: {recovery['hedge_ratio']:.1f}x (overhedge)")
+                emit(f"  • Triggers when position moves against entry")
 
             if recovery.get('uses_dca'):
-                print("\nDCA/Martingale:")
+                emit("\nDCA/Martingale:")
                 if recovery.get('dca_optimal_depth'):
-                    print(f"  • Optimal depth: {recovery['dca_optimal_depth']} levels")
+                    emit(f"  • Optimal depth: {recovery['dca_optimal_depth']} levels")
                 if recovery.get('martingale_multiplier'):
-                    print(f"  • Lot multiplier: {recovery['martingale_multiplier']:.1f}x")
-                print(f"  • Averages down losing positions")
+                    emit(f"  • Lot multiplier: {recovery['martingale_multiplier']:.1f}x")
+                emit(f"  • Averages down losing positions")
 
-            print()
+            emit()
             if recovery.get('max_exposure'):
-                print(f"Maximum Exposure: {recovery['max_exposure']:.2f} lots")
-        print()
+                emit(f"Maximum Exposure: {recovery['max_exposure']:.2f} lots")
+        emit()
 
     # ========== KEY INSIGHTS ==========
-    print("=" * 80)
-    print("💡 KEY INSIGHTS")
-    print("=" * 80)
-    print()
+    emit("=" * 80)
+    emit("💡 KEY INSIGHTS")
+    emit("=" * 80)
+    emit()
 
     insights = []
 
@@ -724,74 +945,77 @@ def generate_report():
         insights.append("✅ Respects HTF levels - institutional approach")
 
     for insight in insights:
-        print(f"  {insight}")
-    print()
+        emit(f"  {insight}")
+    emit()
 
     # ========== IMPLEMENTATION GUIDE ==========
-    print("=" * 80)
-    print("🚀 PYTHON IMPLEMENTATION GUIDE")
-    print("=" * 80)
-    print()
-
-    print("To implement this EA in Python, you need:")
-    print()
-    print("1. Market Data Pipeline:")
-    print("   • Real-time OHLCV data feed (H1 timeframe)")
-    print("   • VWAP calculation with standard deviation bands")
-    print("   • Volume profile calculation (POC, VAH, VAL)")
-    print("   • HTF data (Daily, Weekly levels)")
-    print()
-
-    print("2. Signal Detection:")
+    emit("=" * 80)
+    emit("🚀 PYTHON IMPLEMENTATION GUIDE")
+    emit("=" * 80)
+    emit()
+
+    emit("To implement this EA in Python, you need:")
+    emit()
+    emit("1. Market Data Pipeline:")
+    emit("   • Real-time OHLCV data feed (H1 timeframe)")
+    emit("   • VWAP calculation with standard deviation bands")
+    emit("   • Volume profile calculation (POC, VAH, VAL)")
+    emit("   • HTF data (Daily, Weekly levels)")
+    emit()
+
+    emit("2. Signal Detection:")
     if confluence and confluence.get('optimal_score'):
-        print(f"   • Check {len(confluence.get('most_common_factors', []))} primary factors")
-        print(f"   • Require minimum confluence score of {confluence['optimal_score']}")
-    print("   • Validate against HTF institutional levels")
-    print()
-
-    print("3. Position Management:")
-    print("   • Entry: Confluence-based signals")
-    print("   • Exit: VWAP reversion or fixed pip target")
+        emit(f"   • Check {len(confluence.get('most_common_factors', []))} primary factors")
+        emit(f"   • Require minimum confluence score of {confluence['optimal_score']}")
+    emit("   • Validate against HTF institutional levels")
+    emit()
+
+    emit("3. Position Management:")
+    emit("   • Entry: Confluence-based signals")
+    emit("   • Exit: VWAP reversion or fixed pip target")
     if recovery:
         if recovery.get('uses_grid'):
-            print("   • Grid: Add levels every ~10 pips underwater")
+            emit("   • Grid: Add levels every ~10 pips underwater")
         if recovery.get('uses_hedge'):
-            print("   • Hedge: Activate when 8 pips underwater")
+            emit("   • Hedge: Activate when 8 pips underwater")
         if recovery.get('uses_dca'):
-            print(f"   • DCA: Maximum {recovery.get('dca_optimal_depth', 3)} levels")
-    print()
+            emit(f"   • DCA: Maximum {recovery.get('dca_optimal_depth', 3)} levels")
+    emit()
 
-    print("4. Risk Management:")
-    print("   • Risk 1% per trade")
+    emit("4. Risk Management:")
+    emit("   • Risk 1% per trade")
     if recovery and recovery.get('max_exposure'):
-        print(f"   • Maximum total exposure: {recovery['max_exposure']:.2f} lots")
-    print("   • Stop trading at 10% drawdown")
-    print()
+        emit(f"   • Maximum total exposure: {recovery['max_exposure']:.2f} lots")
+    emit("   • Stop trading at 10% drawdown")
+    emit()
 
     # ========== EXPORT CODE ==========
-    print("=" * 80)
-    print("💾 EXPORTING IMPLEMENTATION CODE")
-    print("=" * 80)
-    print()
-
-    implementation_code = generate_implementation_code(strategy, confluence, htf, recovery)
-
-    # Save to file
-    with open('ea_python_implementation.py', 'w', encoding='utf-8') as f:
-        f.write('#!/usr/bin/env python3\n')
-        f.write('"""\n')
-        f.write('EA Python Implementation - Generated from Reverse Engineering\n')
-        f.write(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n')
-        f.write('"""\n\n')
-        f.write('import time\n')
-        f.write(implementation_code)
-
-    print("✅ Implementation code saved to: ea_python_implementation.py")
-    print()
+    emit("=" * 80)
+    emit("💾 EXPORTING IMPLEMENTATION CODE")
+    emit("=" * 80)
+    emit()
+
+    generated_at = datetime.now()
+
+    # Skip regeneration when the inputs have not changed since the last run
+    cache_key = implementation_cache_key(strategy, confluence, htf, recovery)
+    if implementation_is_current('ea_python_implementation.py', cache_key):
+        emit("✅ Implementation code up to date: ea_python_implementation.py")
+    else:
+        # Stream sections straight to file
+        header = IMPLEMENTATION_HEADER.format(
+            cache_key=cache_key,
+            generated=generated_at.strftime("%Y-%m-%d %H:%M:%S")
+        )
+        with open('ea_python_implementation.py', 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.writelines(chain([header], iter_implementation_code(strategy, confluence, htf, recovery)))
+
+        emit("✅ Implementation code saved to: ea_python_implementation.py")
+    emit()
 
     # Save report summary
     report_summary = {
-        'generation_date': datetime.now().isoformat(),
+        'generation_date': generated_at.isoformat(),
         'strategy': strategy,
         'confluence': confluence,
         'htf_summary': htf,
@@ -799,29 +1023,47 @@ def generate_report():
         'insights': insights
     }
 
-    with open('ea_strategy_report.json', 'w', encoding='utf-8') as f:
-        json.dump(report_summary, f, indent=2, default=str)
-
-    print("✅ Report summary saved to: ea_strategy_report.json")
-    print()
-
-    print("=" * 80)
-    print("✨ NEXT STEPS")
-    print("=" * 80)
-    print()
-    print("1. Review ea_python_implementation.py")
-    print("2. Implement the helper functions:")
-    print("   • get_market_data()")
-    print("   • get_htf_levels()")
-    print("   • place_order() / close_position()")
-    print("3. Connect to your broker's API (MT5, OANDA, etc.)")
-    print("4. Backtest the implementation")
-    print("5. Paper trade before going live")
-    print()
-
-    print("=" * 80)
-    print("REPORT COMPLETE")
-    print("=" * 80)
+    if ORJSON_AVAILABLE:
+        Path('ea_strategy_report.json').write_bytes(orjson.dumps(
+            report_summary,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        ))
+    else:
+        with open('ea_strategy_report.json', 'w', encoding='utf-8') as f:
+            json.dump(report_summary, f, indent=2, default=str)
+
+    emit("✅ Report summary saved to: ea_strategy_report.json")
+    emit()
+
+    emit("=" * 80)
+    emit("✨ NEXT STEPS")
+    emit("=" * 80)
+    emit()
+    emit("1. Review ea_python_implementation.py")
+    emit("2. Implement the helper functions:")
+    emit("   • get_market_data()")
+    emit("   • get_htf_levels()")
+    emit("   • place_order() / close_position()")
+    emit("3. Connect to your broker's API (MT5, OANDA, etc.)")
+    emit("4. Backtest the implementation")
+    emit("5. Paper trade before going live")
+    emit()
+
+    emit("=" * 80)
+    emit("REPORT COMPLETE")
+    emit("=" * 80)
+
+
+def generate_report():
+    """Generate comprehensive EA strategy report"""
+    # Buffer the whole report and hand it to stdout in one write
+    out = StringIO()
+    try:
+        write_report(partial(print, file=out))
+    finally:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 if __name__ == '__main__':
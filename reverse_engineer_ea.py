@@ -7,8 +7,40 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Try to import numba for the compiled volume profile loop
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this many trades the batch runs serially (thread startup isn't worth it)
+PARALLEL_MIN_TRADES = 256
+
+# Indicator columns read at every trade's entry bar
+INDICATOR_COLUMNS = (
+    'RSI_14', 'MACD', 'MACD_signal', 'MACD_histogram', 'SMA_20', 'SMA_50', 'EMA_20',
+    'BB_upper', 'BB_middle', 'BB_lower', 'ATR_14', 'VWAP'
+)
+
+# Bit per boolean level condition, for packing a trade's flags into one integer
+CONDITION_FLAG_BITS = {
+    'at_poc': 1 << 0,
+    'above_vah': 1 << 1,
+    'below_val': 1 << 2,
+    'in_vwap_band_1': 1 << 3,
+    'in_vwap_band_2': 1 << 4,
+    'in_vwap_band_3': 1 << 5,
+    'at_swing_high': 1 << 6,
+    'at_swing_low': 1 << 7,
+    'order_block_bullish': 1 << 8,
+    'order_block_bearish': 1 << 9,
+    'at_lvn': 1 << 10,
+}
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -17,58 +49,423 @@ from src.utils import load_config, load_credentials, setup_logging
 from src.ea_mining import EAMonitor
 
 
-def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
+def _distribute_candle_volume(low_bin, high_bin, volumes, num_bins):
     """
-    Analyze exact market conditions when trade was entered
+    Add each candle's volume, split evenly over the bins it covers, to the
+    profile bins inside its range
 
     Returns:
-        Dict with all market state at entry moment
+        Tuple of (volume per bin, bins in the order they were first touched)
     """
-    try:
-        entry_time = pd.to_datetime(trade.get('entry_time'))
-        if entry_time is None:
-            return None
-    except Exception as e:
-        print(f"Warning: Could not parse entry time: {e}")
-        return None
+    volume_at_bin = np.zeros(num_bins)
+    touched = np.zeros(num_bins, dtype=np.bool_)
+    touch_order = np.empty(num_bins, dtype=np.int64)
+    num_touched = 0
 
-    # Find the exact bar where trade entered
-    # Try exact match first
-    exact_bar = market_data_df[market_data_df.index == entry_time]
+    for i in range(len(volumes)):
+        # Volume is split over every covered bin, even ones outside the profile
+        volume_per_bin = volumes[i] / max(1, high_bin[i] - low_bin[i] + 1)
 
-    if exact_bar.empty:
-        # Find nearest bar (within 60 minutes for H1 data)
-        # This tolerance ensures we catch trades that happen between hourly candles
-        time_diffs = abs(market_data_df.index - entry_time)
-        nearest_idx = time_diffs.argmin()
+        for b in range(max(low_bin[i], 0), min(high_bin[i] + 1, num_bins)):
+            if not touched[b]:
+                touched[b] = True
+                touch_order[num_touched] = b
+                num_touched += 1
+            volume_at_bin[b] += volume_per_bin
 
-        # Handle TimedeltaIndex properly - use direct indexing, not .iloc
-        min_time_diff = time_diffs[nearest_idx]
+    return volume_at_bin, touch_order[:num_touched]
 
-        # Use 60-minute tolerance for H1 bars (matches timeframe)
-        if min_time_diff < pd.Timedelta(minutes=60):
-            exact_bar = market_data_df.iloc[[nearest_idx]]
-        else:
-            return None
 
-    if exact_bar.empty:
+if NUMBA_AVAILABLE:
+    _distribute_candle_volume = numba.njit(cache=True, nogil=True)(_distribute_candle_volume)
+else:
+    def _distribute_candle_volume(low_bin, high_bin, volumes, num_bins):
+        """NumPy version of the candle volume distribution (same accumulation order)"""
+        volume_per_bin = volumes / np.maximum(1, high_bin - low_bin + 1)
+
+        # Flatten each candle's in-range bins in candle order, so bincount
+        # accumulates every bin in the same order as the loop
+        first_bin = np.clip(low_bin, 0, num_bins)
+        counts = np.maximum(np.clip(high_bin + 1, 0, num_bins) - first_bin, 0)
+        offsets = np.cumsum(counts) - counts
+        bin_idx = np.arange(counts.sum()) - np.repeat(offsets - first_bin, counts)
+
+        volume_at_bin = np.bincount(bin_idx, weights=np.repeat(volume_per_bin, counts), minlength=num_bins)
+        touched, first_seen = np.unique(bin_idx, return_index=True)
+        return volume_at_bin, touched[np.argsort(first_seen)]
+
+
+def build_volume_profile(lows, highs, volumes, price_min, bin_size, num_bins=50):
+    """
+    Distribute each candle's volume evenly across the price bins it covers
+
+    Returns:
+        Tuple of (volume per bin as a num_bins array, touched bins in the
+        order they were first touched)
+    """
+    if not (np.isfinite(lows).all() and np.isfinite(highs).all()):
+        raise ValueError("Candle range contains non-finite prices")
+
+    low_bin = ((lows - price_min) / bin_size).astype(np.int64)
+    high_bin = ((highs - price_min) / bin_size).astype(np.int64)
+
+    return _distribute_candle_volume(low_bin, high_bin, np.asarray(volumes, dtype=float), num_bins)
+
+
+def summarize_volume_profile(volume_at_bin, touched_bins, value_area=0.70):
+    """
+    POC, value area and LVN bins of a volume profile, all from one gather
+    and one sort of its touched bins
+
+    Returns:
+        Tuple of (POC bin, value area high bin, value area low bin, LVN bin,
+        touched volumes in first-touched order), or None if no bin was touched
+    """
+    if len(touched_bins) == 0:
         return None
 
-    bar = exact_bar.iloc[0]
+    # Volumes of the touched bins, in first-touched order
+    touched_volumes = volume_at_bin[touched_bins]
+
+    # Highest and lowest volume levels (first touched wins ties)
+    poc_bin = touched_bins[np.argmax(touched_volumes)]
+    lvn_bin = touched_bins[np.argmin(touched_volumes)]
+
+    # Value area: highest-volume bins (ties stay in first-touched order)
+    # accumulated until they hold `value_area` of the total volume
+    order = np.argsort(-touched_volumes, kind='stable')
+    target_volume = sum(touched_volumes.tolist()) * value_area
+    value_area_end = np.searchsorted(np.cumsum(touched_volumes[order]), target_volume, side='left') + 1
+    value_area_bins = touched_bins[order[:value_area_end]]
+
+    return poc_bin, value_area_bins.max(), value_area_bins.min(), lvn_bin, touched_volumes
+
+
+def locate_entry_bars(entry_times, market_index):
+    """
+    Find the bar each trade entered on - exact match, or the nearest bar
+    within 60 minutes for H1 data (catches trades between hourly candles)
+
+    Returns:
+        Array of bar positions in market_index, -1 where no bar is close enough
+    """
+    entry_times = pd.DatetimeIndex(entry_times)
+    if len(market_index) == 0:
+        return np.full(len(entry_times), -1)
+
+    # Compare int64 nanoseconds directly instead of building Timedelta indexes
+    bar_ns = np.asarray(market_index, dtype='datetime64[ns]').view(np.int64)
+    entry_ns = np.asarray(entry_times, dtype='datetime64[ns]').view(np.int64)
+    tolerance = pd.Timedelta(minutes=60).value
+
+    # Candidate bars either side of each entry - the earlier one wins ties
+    after = np.minimum(np.searchsorted(bar_ns, entry_ns, side='left'), len(bar_ns) - 1)
+    before = np.maximum(after - 1, 0)
+    distance_before = np.abs(bar_ns[before] - entry_ns)
+    distance_after = np.abs(bar_ns[after] - entry_ns)
+
+    bar_idx = np.where(distance_before <= distance_after, before, after)
+    close_enough = (np.minimum(distance_before, distance_after) < tolerance) & ~np.isnat(entry_times)
+
+    return np.where(close_enough, bar_idx, -1)
+
+
+def count_consecutive_bars(opens, closes, window=5):
+    """
+    Count the directional run leading into every bar, walking back over the
+    `window` bars before it - doji bars are skipped, and the walk stops at
+    (and counts) the first bar against the run
+
+    Returns:
+        Tuple of (consecutive up bars, consecutive down bars) arrays
+    """
+    direction = np.sign(np.asarray(closes, dtype=float) - np.asarray(opens, dtype=float))
+
+    # Row i holds the `window` bars before bar i; missing bars count as dojis
+    padded = np.concatenate([np.zeros(window), direction])
+    windows = np.lib.stride_tricks.sliding_window_view(padded[:-1], window)
+
+    up_count = np.zeros(len(direction), dtype=np.int64)
+    down_count = np.zeros(len(direction), dtype=np.int64)
+    stopped = np.zeros(len(direction), dtype=bool)
+
+    # Same walk as a per-bar loop from the most recent bar backwards,
+    # done for all bars at once
+    for col in range(window - 1, -1, -1):
+        is_up = ~stopped & (windows[:, col] > 0)
+        is_down = ~stopped & (windows[:, col] < 0)
+        up_count += is_up
+        down_count += is_down
+        stopped |= (is_up & (down_count > 0)) | (is_down & (up_count > 0))
+
+    return up_count, down_count
+
+
+def sma_slope(sma_values, periods=5):
+    """
+    Per-bar change of a moving average over the last `periods` bars
+
+    Returns:
+        Array of slopes, NaN for the first `periods` bars and wherever either
+        end of the change is zero (an unset average)
+    """
+    sma_values = np.asarray(sma_values, dtype=float)
+    sma_prev = np.full(len(sma_values), np.nan)
+    sma_prev[periods:] = sma_values[:-periods]
+
+    has_both = (sma_values != 0) & (sma_prev != 0)
+    has_both[:periods] = False
+
+    return np.where(has_both, (sma_values - sma_prev) / periods, np.nan)
+
+
+def count_volume_rank(volumes, lookback=100):
+    """
+    Count, for every bar, how many of the `lookback` bars before it traded
+    no more volume than it did
+
+    Returns:
+        Array of counts (bars with fewer than `lookback` earlier bars only
+        count the bars they have)
+    """
+    volumes = np.asarray(volumes, dtype=float)
+
+    # Row i holds the `lookback` volumes before bar i; missing bars are NaN
+    # and never compare true
+    padded = np.concatenate([np.full(lookback, np.nan), volumes])
+    windows = np.lib.stride_tricks.sliding_window_view(padded[:-1], lookback)
+
+    return np.count_nonzero(windows <= volumes[:, None], axis=1)
+
+
+def classify_vwap_bands(closes, vwap, lookback=100, min_bars=20):
+    """
+    Close-price standard deviation over the `lookback` bars before every bar,
+    and which deviation band around VWAP each bar's close sits in
+
+    Returns:
+        Tuple of (std array - NaN for bars with `min_bars` or fewer earlier
+        bars, band array - 1/2/3 for the first band containing the close,
+        0 for none)
+    """
+    closes = np.asarray(closes, dtype=float)
+    vwap = np.asarray(vwap, dtype=float)
+    num_bars = len(closes)
+    vwap_std = np.full(num_bars, np.nan)
+
+    # Bars with a full lookback window - row i holds the closes before bar lookback + i
+    if num_bars > lookback:
+        windows = np.lib.stride_tricks.sliding_window_view(closes[:-1], lookback)
+        vwap_std[lookback:] = np.nanstd(windows, axis=1, ddof=1)
+
+    # Early bars only have part of a window
+    for i in range(min_bars + 1, min(lookback, num_bars)):
+        vwap_std[i] = np.nanstd(closes[:i], ddof=1)
+
+    distance = np.abs(closes - vwap)
+    band = np.select(
+        [distance <= vwap_std, distance <= vwap_std * 2, distance <= vwap_std * 3],
+        [1, 2, 3],
+        default=0
+    )
+
+    return vwap_std, band
+
+
+def detect_fair_value_gaps(highs, lows):
+    """
+    Flag the three-candle gaps leading into every bar - candle 1 is three
+    bars back, candle 3 the bar just before
+
+    Returns:
+        Tuple of (gap up, gap down) boolean arrays, False for the first 3 bars
+    """
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+
+    gap_up = np.zeros(len(highs), dtype=bool)
+    gap_down = np.zeros(len(highs), dtype=bool)
+
+    # Bullish FVG: candle1 high < candle3 low / Bearish FVG: candle1 low > candle3 high
+    gap_up[3:] = highs[:-3] < lows[2:-1]
+    gap_down[3:] = lows[:-3] > highs[2:-1]
+
+    return gap_up, gap_down
+
+
+def previous_day_levels(market_data_df, entry_date):
+    """
+    Previous trading day's end-of-day VWAP and volume profile levels for an
+    entry date (looks back up to 5 days to skip weekends)
+
+    Returns:
+        Dict of vwap, poc, vah, val, lvn - None where the day has too few
+        bars or its profile could not be built
+    """
+    levels = {'vwap': None, 'poc': None, 'vah': None, 'val': None, 'lvn': None}
+
+    prev_date = entry_date - timedelta(days=1)
+
+    # Handle weekends - look back up to 5 days
+    max_lookback = 5
+    prev_day_data = pd.DataFrame()
+
+    for i in range(max_lookback):
+        # Get data from previous day - the index is sorted, so bracket
+        # the day by position instead of masking every bar
+        prev_day_start = pd.Timestamp(prev_date)
+        prev_day_end = prev_day_start + timedelta(days=1)
+
+        start, end = market_data_df.index.searchsorted([prev_day_start, prev_day_end])
+        prev_day_data = market_data_df.iloc[start:end]
+
+        if not prev_day_data.empty:
+            break
+
+        prev_date = prev_date - timedelta(days=1)
+
+    if prev_day_data.empty or len(prev_day_data) <= 10:
+        return levels
+
+    # Previous day VWAP
+    if 'VWAP' in prev_day_data.columns:
+        levels['vwap'] = prev_day_data['VWAP'].iloc[-1]  # End of day VWAP
 
     try:
-        bar_idx = market_data_df.index.get_loc(exact_bar.index[0])
+        # Previous day Volume Profile
+        price_min = prev_day_data['low'].min()
+        price_max = prev_day_data['high'].max()
+        price_range = price_max - price_min
+
+        if price_range > 0:
+            num_bins = 50
+            bin_size = price_range / num_bins
+
+            if 'tick_volume' in prev_day_data.columns:
+                prev_volumes = prev_day_data['tick_volume'].to_numpy(dtype=float)
+            else:
+                prev_volumes = np.zeros(len(prev_day_data))
+
+            profile_levels = summarize_volume_profile(*build_volume_profile(
+                prev_day_data['low'].to_numpy(dtype=float),
+                prev_day_data['high'].to_numpy(dtype=float),
+                prev_volumes,
+                price_min, bin_size, num_bins
+            ))
+
+            if profile_levels is not None:
+                poc_bin, vah_bin, val_bin, lvn_bin, _ = profile_levels
+                levels.update({
+                    'poc': price_min + (poc_bin * bin_size) + (bin_size / 2),
+                    'vah': price_min + (vah_bin * bin_size) + bin_size,
+                    'val': price_min + (val_bin * bin_size),
+                    'lvn': price_min + (lvn_bin * bin_size) + (bin_size / 2),
+                })
     except Exception as e:
-        print(f"Warning: Could not locate bar index: {e}")
+        pass  # Leave the profile levels unset if the profile fails
+
+    return levels
+
+
+def build_market_context(market_data_df, lookback=100):
+    """
+    Precompute rolling statistics shared by every trade's entry analysis
+
+    Each array is indexed by bar position and describes the `lookback` bars
+    before that bar (the bar itself excluded), so trades just index into them
+
+    Returns:
+        Dict of NumPy arrays (NaN where no earlier bars exist), the raw
+        OHLCV columns as float arrays, the indicator columns that exist,
+        and per-bar / per-date caches for the volume profile and
+        previous-day levels
+    """
+    consecutive_up, consecutive_down = count_consecutive_bars(market_data_df['open'], market_data_df['close'])
+    missing_column = np.full(len(market_data_df), np.nan)
+    fvg_up, fvg_down = detect_fair_value_gaps(market_data_df['high'], market_data_df['low'])
+    vwap_std, vwap_band = classify_vwap_bands(
+        market_data_df['close'],
+        market_data_df['VWAP'] if 'VWAP' in market_data_df else missing_column,
+        lookback
+    )
+
+    return {
+        'swing_high': market_data_df['high'].rolling(lookback, min_periods=1).max().shift(1).to_numpy(),
+        'swing_low': market_data_df['low'].rolling(lookback, min_periods=1).min().shift(1).to_numpy(),
+        'volume_q80': market_data_df['tick_volume'].rolling(lookback, min_periods=1).quantile(0.8).shift(1).to_numpy(),
+        'volume_rank': count_volume_rank(market_data_df['tick_volume'], lookback),
+        'consecutive_up': consecutive_up,
+        'consecutive_down': consecutive_down,
+        'fvg_up': fvg_up,
+        'fvg_down': fvg_down,
+        'vwap_std': vwap_std,
+        'vwap_band': vwap_band,
+        'sma20_slope': sma_slope(market_data_df['SMA_20']) if 'SMA_20' in market_data_df else missing_column,
+        'sma50_slope': sma_slope(market_data_df['SMA_50']) if 'SMA_50' in market_data_df else missing_column,
+        # Trades slice these instead of the full-width DataFrame
+        'bars': {
+            column: market_data_df[column].to_numpy(dtype=float)
+            for column in ('open', 'high', 'low', 'close', 'tick_volume')
+            if column in market_data_df
+        },
+        'indicators': {
+            column: market_data_df[column].to_numpy()
+            for column in INDICATOR_COLUMNS
+            if column in market_data_df
+        },
+        # Volume profiles by entry bar and previous-day levels by entry
+        # date, filled as trades are analyzed
+        'volume_profiles': {},
+        'prev_day_levels': {},
+    }
+
+
+def analyze_trade_entry_conditions(trade, market_data_df, indicators_df, bar_idx=None, market_context=None,
+                                   entry_time=None):
+    """
+    Analyze exact market conditions when trade was entered
+
+    Args:
+        bar_idx: Position of the entry bar in market_data_df, if already located
+        market_context: build_market_context(market_data_df), if already computed
+        entry_time: The trade's parsed entry Timestamp, if already parsed
+
+    Returns:
+        Dict with all market state at entry moment
+    """
+    if entry_time is None:
+        try:
+            entry_time = pd.to_datetime(trade.get('entry_time'))
+            if entry_time is None:
+                return None
+        except Exception as e:
+            print(f"Warning: Could not parse entry time: {e}")
+            return None
+
+    if bar_idx is None:
+        bar_idx = locate_entry_bars([entry_time], market_data_df.index)[0]
+    if bar_idx == -1:
         return None
 
-    # Get previous bars for context
-    prev_bars = market_data_df.iloc[max(0, bar_idx-5):bar_idx]
-    lookback_bars = market_data_df.iloc[max(0, bar_idx-100):bar_idx]  # For swing detection
+    bar = market_data_df.iloc[bar_idx]
+
+    if market_context is None:
+        market_context = build_market_context(market_data_df)
+
+    # Indicator values at the entry bar (missing columns are left out)
+    indicators = {name: values[bar_idx] for name, values in market_context['indicators'].items()}
+
+    # Get previous bars for context - positions of the last 5 and the last
+    # 100 bars (for swing detection) before the entry bar
+    bars = market_context['bars']
+    prev_start = max(0, bar_idx-5)
+    lookback_start = max(0, bar_idx-100)
+    num_prev_bars = bar_idx - prev_start
+    num_lookback_bars = bar_idx - lookback_start
 
     # Detect swing highs/lows in last 100 bars
-    swing_high = lookback_bars['high'].max() if len(lookback_bars) > 0 else None
-    swing_low = lookback_bars['low'].min() if len(lookback_bars) > 0 else None
+    swing_high = market_context['swing_high'][bar_idx] if num_lookback_bars > 0 else None
+    swing_low = market_context['swing_low'][bar_idx] if num_lookback_bars > 0 else None
 
     # Find nearest swing levels
     at_swing_high = abs(bar['close'] - swing_high) < (bar['close'] * 0.001) if swing_high else False  # Within 0.1%
@@ -84,27 +481,22 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
     in_vwap_band_3 = False
 
     try:
-        if 'VWAP' in bar and pd.notna(bar['VWAP']) and bar['VWAP'] != 0 and len(lookback_bars) > 20:
-            vwap_distance = ((bar['close'] - bar['VWAP']) / bar['VWAP'] * 100)
+        if 'VWAP' in indicators and pd.notna(indicators['VWAP']) and indicators['VWAP'] != 0 and num_lookback_bars > 20:
+            vwap_distance = ((bar['close'] - indicators['VWAP']) / indicators['VWAP'] * 100)
 
-            # Calculate VWAP standard deviation bands
-            vwap_values = lookback_bars['close']
-            vwap_mean = bar['VWAP']
-            vwap_std = vwap_values.std()
+            # VWAP standard deviation bands (std of the lookback closes)
+            vwap_std = market_context['vwap_std'][bar_idx]
 
             if pd.notna(vwap_std) and vwap_std > 0:
                 vwap_std_1 = vwap_std * 1
                 vwap_std_2 = vwap_std * 2
                 vwap_std_3 = vwap_std * 3
 
-                # Check which band current price is in
-                price_distance_from_vwap = abs(bar['close'] - vwap_mean)
-                if price_distance_from_vwap <= vwap_std_1:
-                    in_vwap_band_1 = True
-                elif price_distance_from_vwap <= vwap_std_2:
-                    in_vwap_band_2 = True
-                elif price_distance_from_vwap <= vwap_std_3:
-                    in_vwap_band_3 = True
+                # Which band current price is in
+                vwap_band = market_context['vwap_band'][bar_idx]
+                in_vwap_band_1 = bool(vwap_band == 1)
+                in_vwap_band_2 = bool(vwap_band == 2)
+                in_vwap_band_3 = bool(vwap_band == 3)
     except Exception as e:
         pass  # Silently skip VWAP analysis if it fails
 
@@ -118,69 +510,44 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
     below_val = False
 
     try:
-        if 'tick_volume' in bar and pd.notna(bar['tick_volume']) and len(lookback_bars) > 50:
+        if 'tick_volume' in bar and pd.notna(bar['tick_volume']) and num_lookback_bars > 50:
             # Calculate volume percentile (simple high volume detection)
-            volume_percentile = (lookback_bars['tick_volume'] <= bar['tick_volume']).sum() / len(lookback_bars) * 100
+            volume_percentile = market_context['volume_rank'][bar_idx] / num_lookback_bars * 100
 
             # Calculate Volume Profile POC, VAH, VAL
             # Group bars by price levels and sum volume at each level
-            price_min = lookback_bars['low'].min()
-            price_max = lookback_bars['high'].max()
+            price_min = swing_low
+            price_max = swing_high
             price_range = price_max - price_min
 
             if price_range > 0:
                 # Create price bins (50 levels)
                 num_bins = 50
                 bin_size = price_range / num_bins
-                volume_at_price = {}
-
-                # Aggregate volume at each price level
-                for _, candle in lookback_bars.iterrows():
-                    # For each candle, distribute its volume across the price range it covers
-                    candle_low = candle['low']
-                    candle_high = candle['high']
-                    candle_volume = candle['tick_volume']
-
-                    # Find which bins this candle overlaps
-                    low_bin = int((candle_low - price_min) / bin_size)
-                    high_bin = int((candle_high - price_min) / bin_size)
-
-                    # Distribute volume evenly across bins
-                    bins_covered = max(1, high_bin - low_bin + 1)
-                    volume_per_bin = candle_volume / bins_covered
-
-                    for bin_idx in range(low_bin, high_bin + 1):
-                        if bin_idx < 0 or bin_idx >= num_bins:
-                            continue
-                        if bin_idx not in volume_at_price:
-                            volume_at_price[bin_idx] = 0
-                        volume_at_price[bin_idx] += volume_per_bin
+
+                # Aggregate volume at each price level and summarize it
+                # (POC, value area, LVN) - trades entering on the same bar
+                # share the same lookback window, so reuse both
+                profile = market_context['volume_profiles'].get(bar_idx)
+                if profile is None:
+                    volume_at_bin, touched_bins = build_volume_profile(
+                        bars['low'][lookback_start:bar_idx],
+                        bars['high'][lookback_start:bar_idx],
+                        bars['tick_volume'][lookback_start:bar_idx],
+                        price_min, bin_size, num_bins
+                    )
+                    profile = (volume_at_bin, touched_bins, summarize_volume_profile(volume_at_bin, touched_bins))
+                    market_context['volume_profiles'][bar_idx] = profile
+                volume_at_bin, touched_bins, profile_levels = profile
 
                 # Find POC (Point of Control - highest volume level)
-                if volume_at_price:
-                    poc_bin = max(volume_at_price, key=volume_at_price.get)
+                if profile_levels is not None:
+                    poc_bin, vah_bin, val_bin, lvn_bin, touched_volumes = profile_levels
                     volume_poc = price_min + (poc_bin * bin_size) + (bin_size / 2)
 
-                    # Calculate VAH and VAL (70% value area)
-                    total_volume = sum(volume_at_price.values())
-                    target_volume = total_volume * 0.70
-
-                    # Sort bins by volume (descending)
-                    sorted_bins = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)
-
-                    # Accumulate volume until we hit 70%
-                    accumulated_volume = 0
-                    value_area_bins = []
-                    for bin_idx, vol in sorted_bins:
-                        value_area_bins.append(bin_idx)
-                        accumulated_volume += vol
-                        if accumulated_volume >= target_volume:
-                            break
-
-                    # VAH is highest price in value area, VAL is lowest
-                    if value_area_bins:
-                        volume_vah = price_min + (max(value_area_bins) * bin_size) + bin_size
-                        volume_val = price_min + (min(value_area_bins) * bin_size)
+                    # VAH is highest price in the 70% value area, VAL is lowest
+                    volume_vah = price_min + (vah_bin * bin_size) + bin_size
+                    volume_val = price_min + (val_bin * bin_size)
 
                     # Check if current price is at POC, above VAH, or below VAL
                     if volume_poc:
@@ -198,11 +565,10 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
     lvn_percentile = None
 
     try:
-        if 'tick_volume' in bar and pd.notna(bar['tick_volume']) and len(lookback_bars) > 50:
+        if 'tick_volume' in bar and pd.notna(bar['tick_volume']) and num_lookback_bars > 50:
             # Find low volume nodes (price levels with least volume)
-            if volume_at_price:
+            if profile_levels is not None:
                 # Find LVN (lowest volume level)
-                lvn_bin = min(volume_at_price, key=volume_at_price.get)
                 lvn_price = price_min + (lvn_bin * bin_size) + (bin_size / 2)
 
                 # Check if current price is at LVN
@@ -211,91 +577,87 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
 
                 # Calculate volume percentile at this price level
                 current_bin = int((bar['close'] - price_min) / bin_size)
-                if 0 <= current_bin < num_bins and current_bin in volume_at_price:
-                    total_volume = sum(volume_at_price.values())
-                    current_level_volume = volume_at_price[current_bin]
+                if 0 <= current_bin < num_bins and current_bin in touched_bins:
+                    current_level_volume = volume_at_bin[current_bin]
                     # Percentile = how many levels have less volume
-                    levels_with_less_volume = sum(1 for v in volume_at_price.values() if v < current_level_volume)
-                    lvn_percentile = (levels_with_less_volume / len(volume_at_price)) * 100
+                    levels_with_less_volume = int(np.count_nonzero(touched_volumes < current_level_volume))
+                    lvn_percentile = (levels_with_less_volume / len(touched_bins)) * 100
     except Exception as e:
         pass  # Silently skip LVN analysis if it fails
 
     # Order block detection (large volume candle followed by reversal)
     order_block_bullish = False
     order_block_bearish = False
-    if len(lookback_bars) >= 3:
-        for i in range(len(lookback_bars) - 3, len(lookback_bars)):
-            if i < 0:
-                continue
-            candle = lookback_bars.iloc[i]
-            volume_threshold = lookback_bars['tick_volume'].quantile(0.8)
-
-            # Bullish order block: High volume down candle followed by reversal up
-            if (candle['tick_volume'] > volume_threshold and
-                candle['close'] < candle['open'] and
-                i < len(lookback_bars) - 1):
-                next_candle = lookback_bars.iloc[i + 1]
-                if next_candle['close'] > next_candle['open']:
-                    # Check if current price is near this level
-                    if abs(bar['close'] - candle['low']) < (bar['close'] * 0.002):  # Within 0.2%
-                        order_block_bullish = True
-
-            # Bearish order block: High volume up candle followed by reversal down
-            if (candle['tick_volume'] > volume_threshold and
-                candle['close'] > candle['open'] and
-                i < len(lookback_bars) - 1):
-                next_candle = lookback_bars.iloc[i + 1]
-                if next_candle['close'] < next_candle['open']:
-                    # Check if current price is near this level
-                    if abs(bar['close'] - candle['high']) < (bar['close'] * 0.002):  # Within 0.2%
-                        order_block_bearish = True
+    if num_lookback_bars >= 3:
+        # Only the last three candles can start an order block, and each
+        # needs the candle after it - compare them as arrays in one pass
+        candle_open = bars['open'][bar_idx-3:bar_idx]
+        candle_high = bars['high'][bar_idx-3:bar_idx]
+        candle_low = bars['low'][bar_idx-3:bar_idx]
+        candle_close = bars['close'][bar_idx-3:bar_idx]
+        volume_threshold = market_context['volume_q80'][bar_idx]
+
+        high_volume = bars['tick_volume'][bar_idx-3:bar_idx-1] > volume_threshold
+        next_up = candle_close[1:] > candle_open[1:]
+        next_down = candle_close[1:] < candle_open[1:]
+        proximity = bar['close'] * 0.002  # Within 0.2%
+
+        # Bullish order block: High volume down candle followed by reversal up,
+        # with current price near its low
+        order_block_bullish = bool((
+            high_volume & (candle_close[:-1] < candle_open[:-1]) & next_up &
+            (np.abs(bar['close'] - candle_low[:-1]) < proximity)
+        ).any())
+
+        # Bearish order block: High volume up candle followed by reversal down,
+        # with current price near its high
+        order_block_bearish = bool((
+            high_volume & (candle_close[:-1] > candle_open[:-1]) & next_down &
+            (np.abs(bar['close'] - candle_high[:-1]) < proximity)
+        ).any())
 
     # Liquidity sweep detection (stop hunt - quick spike then reversal)
     liquidity_sweep = False
-    if len(prev_bars) >= 2:
-        prev1 = prev_bars.iloc[-1]
-        prev2 = prev_bars.iloc[-2] if len(prev_bars) >= 2 else None
-
-        if prev2 is not None:
-            # Look for spike above resistance then immediate reversal down
-            recent_high = lookback_bars['high'].max()
-            if (prev1['high'] > recent_high and
-                prev1['close'] < prev1['open'] and
-                bar['close'] < prev1['close']):
-                liquidity_sweep = True
-
-            # Or spike below support then immediate reversal up
-            recent_low = lookback_bars['low'].min()
-            if (prev1['low'] < recent_low and
-                prev1['close'] > prev1['open'] and
-                bar['close'] > prev1['close']):
-                liquidity_sweep = True
+    if num_prev_bars >= 2:
+        prev1_open = bars['open'][bar_idx-1]
+        prev1_close = bars['close'][bar_idx-1]
+
+        # Look for spike above resistance then immediate reversal down
+        recent_high = swing_high
+        if (bars['high'][bar_idx-1] > recent_high and
+            prev1_close < prev1_open and
+            bar['close'] < prev1_close):
+            liquidity_sweep = True
+
+        # Or spike below support then immediate reversal up
+        recent_low = swing_low
+        if (bars['low'][bar_idx-1] < recent_low and
+            prev1_close > prev1_open and
+            bar['close'] > prev1_close):
+            liquidity_sweep = True
 
     # Fair value gap (FVG) detection - price imbalance/gap
     fair_value_gap_up = False
     fair_value_gap_down = False
     fvg_size = None
 
-    if len(prev_bars) >= 3:
-        candle1 = prev_bars.iloc[-3]
-        candle2 = prev_bars.iloc[-2]
-        candle3 = prev_bars.iloc[-1]
-
-        # Bullish FVG: Gap up (candle1 high < candle3 low)
-        if candle1['high'] < candle3['low']:
-            gap_size = candle3['low'] - candle1['high']
-            fvg_size = (gap_size / bar['close']) * 100
-            # Check if current price is in the gap
-            if candle1['high'] <= bar['close'] <= candle3['low']:
-                fair_value_gap_up = True
-
-        # Bearish FVG: Gap down (candle1 low > candle3 high)
-        if candle1['low'] > candle3['high']:
-            gap_size = candle1['low'] - candle3['high']
-            fvg_size = (gap_size / bar['close']) * 100
-            # Check if current price is in the gap
-            if candle3['high'] <= bar['close'] <= candle1['low']:
-                fair_value_gap_down = True
+    # Bullish FVG: Gap up (candle1 high < candle3 low)
+    if market_context['fvg_up'][bar_idx]:
+        candle1_high, candle3_low = bars['high'][bar_idx-3], bars['low'][bar_idx-1]
+        gap_size = candle3_low - candle1_high
+        fvg_size = (gap_size / bar['close']) * 100
+        # Check if current price is in the gap
+        if candle1_high <= bar['close'] <= candle3_low:
+            fair_value_gap_up = True
+
+    # Bearish FVG: Gap down (candle1 low > candle3 high)
+    if market_context['fvg_down'][bar_idx]:
+        candle1_low, candle3_high = bars['low'][bar_idx-3], bars['high'][bar_idx-1]
+        gap_size = candle1_low - candle3_high
+        fvg_size = (gap_size / bar['close']) * 100
+        # Check if current price is in the gap
+        if candle3_high <= bar['close'] <= candle1_low:
+            fair_value_gap_down = True
 
     conditions = {
         'entry_time': entry_time,
@@ -319,28 +681,28 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
         'price_vs_open': ((bar['close'] - bar['open']) / bar['open'] * 100) if bar['open'] != 0 else 0,
 
         # Indicators at entry
-        'rsi_14': bar.get('RSI_14', None),
-        'macd': bar.get('MACD', None),
-        'macd_signal': bar.get('MACD_signal', None),
-        'macd_histogram': bar.get('MACD_histogram', None),
-        'sma_20': bar.get('SMA_20', None),
-        'sma_50': bar.get('SMA_50', None),
-        'ema_20': bar.get('EMA_20', None),
-        'bb_upper': bar.get('BB_upper', None),
-        'bb_middle': bar.get('BB_middle', None),
-        'bb_lower': bar.get('BB_lower', None),
-        'atr_14': bar.get('ATR_14', None),
+        'rsi_14': indicators.get('RSI_14'),
+        'macd': indicators.get('MACD'),
+        'macd_signal': indicators.get('MACD_signal'),
+        'macd_histogram': indicators.get('MACD_histogram'),
+        'sma_20': indicators.get('SMA_20'),
+        'sma_50': indicators.get('SMA_50'),
+        'ema_20': indicators.get('EMA_20'),
+        'bb_upper': indicators.get('BB_upper'),
+        'bb_middle': indicators.get('BB_middle'),
+        'bb_lower': indicators.get('BB_lower'),
+        'atr_14': indicators.get('ATR_14'),
 
         # Price position relative to indicators
-        'price_vs_sma20': ((bar['close'] - bar.get('SMA_20', bar['close'])) / bar['close'] * 100) if 'SMA_20' in bar and bar['SMA_20'] else None,
-        'price_vs_sma50': ((bar['close'] - bar.get('SMA_50', bar['close'])) / bar['close'] * 100) if 'SMA_50' in bar and bar['SMA_50'] else None,
+        'price_vs_sma20': ((bar['close'] - indicators['SMA_20']) / bar['close'] * 100) if indicators.get('SMA_20') else None,
+        'price_vs_sma50': ((bar['close'] - indicators['SMA_50']) / bar['close'] * 100) if indicators.get('SMA_50') else None,
 
         # Trend detection (using MA slopes)
-        'sma20_slope': None,
-        'sma50_slope': None,
+        'sma20_slope': market_context['sma20_slope'][bar_idx],
+        'sma50_slope': market_context['sma50_slope'][bar_idx],
 
         # Previous bar momentum
-        'prev_bar_direction': 'up' if len(prev_bars) > 0 and prev_bars.iloc[-1]['close'] > prev_bars.iloc[-1]['open'] else 'down',
+        'prev_bar_direction': 'up' if num_prev_bars > 0 and bars['close'][bar_idx-1] > bars['open'][bar_idx-1] else 'down',
         'consecutive_up_bars': 0,
         'consecutive_down_bars': 0,
 
@@ -353,7 +715,7 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
         'distance_to_swing_low': ((bar['close'] - swing_low) / bar['close'] * 100) if swing_low else None,
 
         # VWAP analysis
-        'vwap': bar.get('VWAP', None),
+        'vwap': indicators.get('VWAP'),
         'vwap_distance_pct': vwap_distance,
         'above_vwap': vwap_distance > 0 if vwap_distance else None,
         'vwap_std_1': vwap_std_1,
@@ -392,33 +754,9 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
         'fvg_size_pct': fvg_size,
     }
 
-    # Calculate MA slopes if enough history
-    if bar_idx >= 5 and 'SMA_20' in bar:
-        sma20_prev = market_data_df.iloc[bar_idx-5].get('SMA_20')
-        if sma20_prev and bar.get('SMA_20'):
-            conditions['sma20_slope'] = (bar['SMA_20'] - sma20_prev) / 5
-
-    if bar_idx >= 5 and 'SMA_50' in bar:
-        sma50_prev = market_data_df.iloc[bar_idx-5].get('SMA_50')
-        if sma50_prev and bar.get('SMA_50'):
-            conditions['sma50_slope'] = (bar['SMA_50'] - sma50_prev) / 5
-
     # Count consecutive directional bars
-    up_count = 0
-    down_count = 0
-    for i in range(len(prev_bars)-1, -1, -1):
-        prev = prev_bars.iloc[i]
-        if prev['close'] > prev['open']:
-            up_count += 1
-            if down_count > 0:
-                break
-        elif prev['close'] < prev['open']:
-            down_count += 1
-            if up_count > 0:
-                break
-
-    conditions['consecutive_up_bars'] = up_count
-    conditions['consecutive_down_bars'] = down_count
+    conditions['consecutive_up_bars'] = int(market_context['consecutive_up'][bar_idx])
+    conditions['consecutive_down_bars'] = int(market_context['consecutive_down'][bar_idx])
 
     # Calculate previous day levels
     at_prev_poc = False
@@ -428,99 +766,24 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
     at_prev_lvn = False
 
     try:
-        from datetime import timedelta
-
+        # Every trade entered on the same date shares the same previous day
         entry_date = entry_time.date()
-        prev_date = entry_date - timedelta(days=1)
-
-        # Handle weekends - look back up to 5 days
-        max_lookback = 5
-        prev_day_data = pd.DataFrame()
-
-        for i in range(max_lookback):
-            # Get data from previous day
-            prev_day_start = pd.Timestamp(prev_date)
-            prev_day_end = prev_day_start + timedelta(days=1)
-
-            prev_day_data = market_data_df[
-                (market_data_df.index >= prev_day_start) &
-                (market_data_df.index < prev_day_end)
-            ]
+        prev_day_levels = market_context['prev_day_levels'].get(entry_date)
+        if prev_day_levels is None:
+            prev_day_levels = previous_day_levels(market_data_df, entry_date)
+            market_context['prev_day_levels'][entry_date] = prev_day_levels
 
-            if not prev_day_data.empty:
-                break
-
-            prev_date = prev_date - timedelta(days=1)
+        tolerance = bar['close'] * 0.003  # 0.3% tolerance
 
-        if not prev_day_data.empty and len(prev_day_data) > 10:
-            tolerance = bar['close'] * 0.003  # 0.3% tolerance
+        prev_vwap = prev_day_levels['vwap']
+        if prev_vwap is not None and pd.notna(prev_vwap) and abs(bar['close'] - prev_vwap) < tolerance:
+            at_prev_vwap = True
 
-            # Calculate previous day VWAP
-            if 'VWAP' in prev_day_data.columns:
-                prev_vwap = prev_day_data['VWAP'].iloc[-1]  # End of day VWAP
-                if pd.notna(prev_vwap) and abs(bar['close'] - prev_vwap) < tolerance:
-                    at_prev_vwap = True
-
-            # Calculate previous day Volume Profile
-            price_min = prev_day_data['low'].min()
-            price_max = prev_day_data['high'].max()
-            price_range = price_max - price_min
-
-            if price_range > 0:
-                num_bins = 50
-                bin_size = price_range / num_bins
-                volume_at_price = {}
-
-                for _, candle in prev_day_data.iterrows():
-                    candle_low = candle['low']
-                    candle_high = candle['high']
-                    candle_volume = candle.get('tick_volume', 0)
-
-                    low_bin = int((candle_low - price_min) / bin_size)
-                    high_bin = int((candle_high - price_min) / bin_size)
-                    bins_covered = max(1, high_bin - low_bin + 1)
-                    volume_per_bin = candle_volume / bins_covered
-
-                    for bin_idx in range(low_bin, high_bin + 1):
-                        if 0 <= bin_idx < num_bins:
-                            if bin_idx not in volume_at_price:
-                                volume_at_price[bin_idx] = 0
-                            volume_at_price[bin_idx] += volume_per_bin
-
-                if volume_at_price:
-                    # Previous day POC
-                    poc_bin = max(volume_at_price, key=volume_at_price.get)
-                    prev_poc = price_min + (poc_bin * bin_size) + (bin_size / 2)
-                    if abs(bar['close'] - prev_poc) < tolerance:
-                        at_prev_poc = True
-
-                    # Previous day VAH/VAL
-                    total_volume = sum(volume_at_price.values())
-                    target_volume = total_volume * 0.70
-                    sorted_bins = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)
-                    accumulated_volume = 0
-                    value_area_bins = []
-
-                    for bin_idx, vol in sorted_bins:
-                        value_area_bins.append(bin_idx)
-                        accumulated_volume += vol
-                        if accumulated_volume >= target_volume:
-                            break
-
-                    if value_area_bins:
-                        prev_vah = price_min + (max(value_area_bins) * bin_size) + bin_size
-                        prev_val = price_min + (min(value_area_bins) * bin_size)
-
-                        if abs(bar['close'] - prev_vah) < tolerance:
-                            at_prev_vah = True
-                        if abs(bar['close'] - prev_val) < tolerance:
-                            at_prev_val = True
-
-                    # Previous day LVN
-                    lvn_bin = min(volume_at_price, key=volume_at_price.get)
-                    prev_lvn = price_min + (lvn_bin * bin_size) + (bin_size / 2)
-                    if abs(bar['close'] - prev_lvn) < tolerance:
-                        at_prev_lvn = True
+        if prev_day_levels['poc'] is not None:
+            at_prev_poc = abs(bar['close'] - prev_day_levels['poc']) < tolerance
+            at_prev_vah = abs(bar['close'] - prev_day_levels['vah']) < tolerance
+            at_prev_val = abs(bar['close'] - prev_day_levels['val']) < tolerance
+            at_prev_lvn = abs(bar['close'] - prev_day_levels['lvn']) < tolerance
 
     except Exception as e:
         pass  # Silently skip previous day analysis if it fails
@@ -535,14 +798,132 @@ def analyze_trade_entry_conditions(trade, market_data_df, indicators_df):
     return conditions
 
 
+def analyze_trades_batch(trades_df, market_data_df, indicators_df, max_workers=None):
+    """
+    Analyze entry conditions for every trade, locating all entry bars in one pass
+
+    Trades only read the shared market data and context, so larger batches
+    are spread over a thread pool
+
+    Args:
+        max_workers: Thread pool size (None = executor default, 1 = serial)
+
+    Returns:
+        List of condition dicts aligned with trades_df rows (None where no bar matched)
+    """
+    entry_times = pd.to_datetime(trades_df['entry_time'])
+    bar_positions = locate_entry_bars(entry_times, market_data_df.index)
+    market_context = build_market_context(market_data_df)
+
+    def analyze(job):
+        (_, trade), entry_time, bar_idx = job
+        if bar_idx == -1:
+            return None
+
+        return analyze_trade_entry_conditions(
+            trade, market_data_df, indicators_df, bar_idx=bar_idx, market_context=market_context,
+            entry_time=entry_time
+        )
+
+    jobs = zip(trades_df.iterrows(), entry_times, bar_positions)
+
+    if max_workers == 1 or len(trades_df) < PARALLEL_MIN_TRADES:
+        return [analyze(job) for job in jobs]
+
+    # map keeps results in trade order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(analyze, jobs))
+
+
+def conditions_to_dataframe(all_trades_conditions):
+    """
+    Build the conditions table column by column - one list per field instead
+    of pandas converting every trade's dict row by row
+
+    Returns:
+        DataFrame with one row per trade (a DataFrame passed in is returned as is)
+    """
+    if isinstance(all_trades_conditions, pd.DataFrame):
+        return all_trades_conditions
+
+    fields = dict.fromkeys(field for conditions in all_trades_conditions for field in conditions)
+
+    return pd.DataFrame({
+        field: [conditions.get(field, np.nan) for conditions in all_trades_conditions]
+        for field in fields
+    })
+
+
+def pack_condition_flags(conditions_df):
+    """
+    Pack every trade's level condition flags into one bitmask, so level
+    counts and combined conditions are integer ops on a single array
+
+    Returns:
+        uint16 array with CONDITION_FLAG_BITS set where the flag is True
+        (a missing flag column is never set)
+    """
+    flags = np.zeros(len(conditions_df), dtype=np.uint16)
+
+    for field, bit in CONDITION_FLAG_BITS.items():
+        if field in conditions_df.columns:
+            flags[conditions_df[field].to_numpy() == True] |= bit
+
+    return flags
+
+
+# Flag rules per side: (flag column, share of trades it must exceed, rule).
+# Evaluated in order after the indicator rules; {avg_distance} is the mean
+# VWAP distance of the side's trades on their side of VWAP
+BUY_FLAG_RULES = (
+    ('at_swing_low', 0.4, "BUY at swing lows (support)"),
+    ('below_vwap_entry', 0.5, "BUY below VWAP (avg {avg_distance:.1f}% below)"),
+    # VWAP deviation band patterns - FOCUS ON BANDS 1 & 2 FOR MEAN REVERSION
+    ('in_vwap_band_1', 0.2, "🎯 BUY at VWAP -1σ band (tight mean reversion)"),
+    ('in_vwap_band_2', 0.2, "🎯 BUY at VWAP -2σ band (strong mean reversion)"),
+    ('in_vwap_band_3', 0.15, "BUY at VWAP -3σ band (extreme deviation)"),
+    # Combined VWAP band patterns with other market structure
+    ('vwap_band_1_or_2_swing_low', 0.15, "🎯 BUY at VWAP Band 1/2 + SWING LOW (high probability)"),
+    ('vwap_band_1_or_2_order_block_bullish', 0.1, "🎯 BUY at VWAP Band 1/2 + BULLISH ORDER BLOCK"),
+    ('vwap_band_1_or_2_below_val', 0.1, "🎯 BUY at VWAP Band 1/2 + BELOW VAL (oversold)"),
+    # Volume Profile, order block, liquidity and FVG patterns
+    ('at_poc', 0.3, "BUY at Volume Profile POC (high volume node)"),
+    ('below_val', 0.4, "BUY below Value Area Low (VAL) - bearish extension reversal"),
+    ('high_volume_area', 0.4, "BUY at high volume bars"),
+    ('order_block_bullish', 0.3, "BUY at bullish order blocks (institutional zones)"),
+    ('liquidity_sweep', 0.2, "BUY after liquidity sweep (stop hunt reversal)"),
+    ('fair_value_gap_up', 0.25, "BUY in bullish FVG (filling price gap)")
+)
+
+SELL_FLAG_RULES = (
+    ('at_swing_high', 0.4, "SELL at swing highs (resistance)"),
+    ('above_vwap_entry', 0.5, "SELL above VWAP (avg {avg_distance:.1f}% above)"),
+    # VWAP deviation band patterns - FOCUS ON BANDS 1 & 2 FOR MEAN REVERSION
+    ('in_vwap_band_1', 0.2, "🎯 SELL at VWAP +1σ band (tight mean reversion)"),
+    ('in_vwap_band_2', 0.2, "🎯 SELL at VWAP +2σ band (strong mean reversion)"),
+    ('in_vwap_band_3', 0.15, "SELL at VWAP +3σ band (extreme deviation)"),
+    # Combined VWAP band patterns with other market structure
+    ('vwap_band_1_or_2_swing_high', 0.15, "🎯 SELL at VWAP Band 1/2 + SWING HIGH (high probability)"),
+    ('vwap_band_1_or_2_order_block_bearish', 0.1, "🎯 SELL at VWAP Band 1/2 + BEARISH ORDER BLOCK"),
+    ('vwap_band_1_or_2_above_vah', 0.1, "🎯 SELL at VWAP Band 1/2 + ABOVE VAH (overbought)"),
+    # Volume Profile, order block, liquidity and FVG patterns
+    ('at_poc', 0.3, "SELL at Volume Profile POC (high volume node)"),
+    ('above_vah', 0.4, "SELL above Value Area High (VAH) - bullish extension reversal"),
+    ('high_volume_area', 0.4, "SELL at high volume bars"),
+    ('order_block_bearish', 0.3, "SELL at bearish order blocks (institutional zones)"),
+    ('liquidity_sweep', 0.2, "SELL after liquidity sweep (stop hunt reversal)"),
+    ('fair_value_gap_down', 0.25, "SELL in bearish FVG (filling price gap)")
+)
+
+
 def find_trade_patterns(all_trades_conditions):
     """
     Cluster trades by similar conditions to find entry rules
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
-    df = pd.DataFrame(all_trades_conditions)
+    df = conditions_to_dataframe(all_trades_conditions)
 
     patterns = {
         'buy_patterns': [],
@@ -551,9 +932,34 @@ def find_trade_patterns(all_trades_conditions):
         'exit_rules': []
     }
 
+    # Every flag the rule tables count, per trade - counted for both sides
+    # in a single groupby pass instead of one DataFrame filter per rule
+    flags = pd.DataFrame({
+        column: df[column].to_numpy() == True
+        for column in (
+            'at_swing_low', 'at_swing_high', 'in_vwap_band_1', 'in_vwap_band_2', 'in_vwap_band_3',
+            'at_poc', 'below_val', 'above_vah', 'high_volume_area', 'order_block_bullish',
+            'order_block_bearish', 'liquidity_sweep', 'fair_value_gap_up', 'fair_value_gap_down'
+        )
+    })
+    has_vwap_distance = df['vwap_distance_pct'].notna().to_numpy()
+    flags['below_vwap_entry'] = (df['above_vwap'].to_numpy() == False) & has_vwap_distance
+    flags['above_vwap_entry'] = (df['above_vwap'].to_numpy() == True) & has_vwap_distance
+
+    vwap_band_1_or_2 = flags['in_vwap_band_1'] | flags['in_vwap_band_2']
+    for column in ('swing_low', 'swing_high'):
+        flags[f'vwap_band_1_or_2_{column}'] = vwap_band_1_or_2 & flags[f'at_{column}']
+    for column in ('order_block_bullish', 'order_block_bearish', 'below_val', 'above_vah'):
+        flags[f'vwap_band_1_or_2_{column}'] = vwap_band_1_or_2 & flags[column]
+
+    flag_counts = flags.groupby(df['trade_type'].to_numpy()).sum()
+
     # Analyze BUY entries
-    buy_trades = df[df['trade_type'] == 'buy']
+    is_buy = (df['trade_type'] == 'buy').to_numpy()
+    buy_trades = df[is_buy]
     if not buy_trades.empty:
+        num_buys = len(buy_trades)
+
         # RSI patterns
         buy_with_rsi = buy_trades[buy_trades['rsi_14'].notna()]
         if not buy_with_rsi.empty:
@@ -590,136 +996,25 @@ def find_trade_patterns(all_trades_conditions):
                     'sample_size': len(buy_with_sma)
                 })
 
-        # Swing low patterns
-        buy_at_swing_low = buy_trades[buy_trades['at_swing_low'] == True]
-        if len(buy_at_swing_low) > len(buy_trades) * 0.4:
-            patterns['buy_patterns'].append({
-                'rule': "BUY at swing lows (support)",
-                'confidence': len(buy_at_swing_low) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # VWAP patterns
-        buy_below_vwap = buy_trades[(buy_trades['above_vwap'] == False) & (buy_trades['vwap_distance_pct'].notna())]
-        if len(buy_below_vwap) > len(buy_trades) * 0.5:
-            avg_distance = buy_below_vwap['vwap_distance_pct'].mean()
-            patterns['buy_patterns'].append({
-                'rule': f"BUY below VWAP (avg {avg_distance:.1f}% below)",
-                'confidence': len(buy_below_vwap) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # VWAP deviation band patterns - FOCUS ON BANDS 1 & 2 FOR MEAN REVERSION
-        buy_at_vwap_1sd = buy_trades[buy_trades['in_vwap_band_1'] == True]
-        if len(buy_at_vwap_1sd) > len(buy_trades) * 0.2:
-            patterns['buy_patterns'].append({
-                'rule': "🎯 BUY at VWAP -1σ band (tight mean reversion)",
-                'confidence': len(buy_at_vwap_1sd) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        buy_at_vwap_2sd = buy_trades[buy_trades['in_vwap_band_2'] == True]
-        if len(buy_at_vwap_2sd) > len(buy_trades) * 0.2:
-            patterns['buy_patterns'].append({
-                'rule': "🎯 BUY at VWAP -2σ band (strong mean reversion)",
-                'confidence': len(buy_at_vwap_2sd) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        buy_at_vwap_3sd = buy_trades[buy_trades['in_vwap_band_3'] == True]
-        if len(buy_at_vwap_3sd) > len(buy_trades) * 0.15:
-            patterns['buy_patterns'].append({
-                'rule': "BUY at VWAP -3σ band (extreme deviation)",
-                'confidence': len(buy_at_vwap_3sd) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # Combined VWAP band patterns with other market structure
-        buy_vwap_band_1_or_2 = buy_trades[(buy_trades['in_vwap_band_1'] == True) | (buy_trades['in_vwap_band_2'] == True)]
-        if len(buy_vwap_band_1_or_2) > 0:
-            # Band 1/2 + Swing Low
-            buy_vwap_plus_swing = buy_vwap_band_1_or_2[buy_vwap_band_1_or_2['at_swing_low'] == True]
-            if len(buy_vwap_plus_swing) > len(buy_trades) * 0.15:
-                patterns['buy_patterns'].append({
-                    'rule': "🎯 BUY at VWAP Band 1/2 + SWING LOW (high probability)",
-                    'confidence': len(buy_vwap_plus_swing) / len(buy_trades),
-                    'sample_size': len(buy_trades)
-                })
-
-            # Band 1/2 + Order Block
-            buy_vwap_plus_ob = buy_vwap_band_1_or_2[buy_vwap_band_1_or_2['order_block_bullish'] == True]
-            if len(buy_vwap_plus_ob) > len(buy_trades) * 0.1:
-                patterns['buy_patterns'].append({
-                    'rule': "🎯 BUY at VWAP Band 1/2 + BULLISH ORDER BLOCK",
-                    'confidence': len(buy_vwap_plus_ob) / len(buy_trades),
-                    'sample_size': len(buy_trades)
-                })
+        buy_counts = flag_counts.loc['buy']
+        below_vwap = flags['below_vwap_entry'].to_numpy()[is_buy]
+        avg_distance = buy_trades['vwap_distance_pct'][below_vwap].mean()
 
-            # Band 1/2 + Below VAL
-            buy_vwap_plus_val = buy_vwap_band_1_or_2[buy_vwap_band_1_or_2['below_val'] == True]
-            if len(buy_vwap_plus_val) > len(buy_trades) * 0.1:
+        for column, min_share, rule in BUY_FLAG_RULES:
+            count = buy_counts[column]
+            if count > num_buys * min_share:
                 patterns['buy_patterns'].append({
-                    'rule': "🎯 BUY at VWAP Band 1/2 + BELOW VAL (oversold)",
-                    'confidence': len(buy_vwap_plus_val) / len(buy_trades),
-                    'sample_size': len(buy_trades)
+                    'rule': rule.format(avg_distance=avg_distance),
+                    'confidence': count / num_buys,
+                    'sample_size': num_buys
                 })
 
-        # Volume Profile patterns
-        buy_at_poc = buy_trades[buy_trades['at_poc'] == True]
-        if len(buy_at_poc) > len(buy_trades) * 0.3:
-            patterns['buy_patterns'].append({
-                'rule': "BUY at Volume Profile POC (high volume node)",
-                'confidence': len(buy_at_poc) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        buy_below_val = buy_trades[buy_trades['below_val'] == True]
-        if len(buy_below_val) > len(buy_trades) * 0.4:
-            patterns['buy_patterns'].append({
-                'rule': "BUY below Value Area Low (VAL) - bearish extension reversal",
-                'confidence': len(buy_below_val) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # High volume area patterns
-        buy_high_vol = buy_trades[buy_trades['high_volume_area'] == True]
-        if len(buy_high_vol) > len(buy_trades) * 0.4:
-            patterns['buy_patterns'].append({
-                'rule': "BUY at high volume bars",
-                'confidence': len(buy_high_vol) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # Order block patterns
-        buy_at_bullish_ob = buy_trades[buy_trades['order_block_bullish'] == True]
-        if len(buy_at_bullish_ob) > len(buy_trades) * 0.3:
-            patterns['buy_patterns'].append({
-                'rule': "BUY at bullish order blocks (institutional zones)",
-                'confidence': len(buy_at_bullish_ob) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # Liquidity sweep patterns
-        buy_after_sweep = buy_trades[buy_trades['liquidity_sweep'] == True]
-        if len(buy_after_sweep) > len(buy_trades) * 0.2:
-            patterns['buy_patterns'].append({
-                'rule': "BUY after liquidity sweep (stop hunt reversal)",
-                'confidence': len(buy_after_sweep) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
-        # Fair value gap patterns
-        buy_in_fvg = buy_trades[buy_trades['fair_value_gap_up'] == True]
-        if len(buy_in_fvg) > len(buy_trades) * 0.25:
-            patterns['buy_patterns'].append({
-                'rule': "BUY in bullish FVG (filling price gap)",
-                'confidence': len(buy_in_fvg) / len(buy_trades),
-                'sample_size': len(buy_trades)
-            })
-
     # Analyze SELL entries
-    sell_trades = df[df['trade_type'] == 'sell']
+    is_sell = (df['trade_type'] == 'sell').to_numpy()
+    sell_trades = df[is_sell]
     if not sell_trades.empty:
+        num_sells = len(sell_trades)
+
         # RSI patterns
         sell_with_rsi = sell_trades[sell_trades['rsi_14'].notna()]
         if not sell_with_rsi.empty:
@@ -743,137 +1038,23 @@ def find_trade_patterns(all_trades_conditions):
                     'sample_size': len(sell_with_macd)
                 })
 
-        # Swing high patterns
-        sell_at_swing_high = sell_trades[sell_trades['at_swing_high'] == True]
-        if len(sell_at_swing_high) > len(sell_trades) * 0.4:
-            patterns['sell_patterns'].append({
-                'rule': "SELL at swing highs (resistance)",
-                'confidence': len(sell_at_swing_high) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # VWAP patterns
-        sell_above_vwap = sell_trades[(sell_trades['above_vwap'] == True) & (sell_trades['vwap_distance_pct'].notna())]
-        if len(sell_above_vwap) > len(sell_trades) * 0.5:
-            avg_distance = sell_above_vwap['vwap_distance_pct'].mean()
-            patterns['sell_patterns'].append({
-                'rule': f"SELL above VWAP (avg {avg_distance:.1f}% above)",
-                'confidence': len(sell_above_vwap) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # VWAP deviation band patterns - FOCUS ON BANDS 1 & 2 FOR MEAN REVERSION
-        sell_at_vwap_1sd = sell_trades[sell_trades['in_vwap_band_1'] == True]
-        if len(sell_at_vwap_1sd) > len(sell_trades) * 0.2:
-            patterns['sell_patterns'].append({
-                'rule': "🎯 SELL at VWAP +1σ band (tight mean reversion)",
-                'confidence': len(sell_at_vwap_1sd) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        sell_at_vwap_2sd = sell_trades[sell_trades['in_vwap_band_2'] == True]
-        if len(sell_at_vwap_2sd) > len(sell_trades) * 0.2:
-            patterns['sell_patterns'].append({
-                'rule': "🎯 SELL at VWAP +2σ band (strong mean reversion)",
-                'confidence': len(sell_at_vwap_2sd) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        sell_at_vwap_3sd = sell_trades[sell_trades['in_vwap_band_3'] == True]
-        if len(sell_at_vwap_3sd) > len(sell_trades) * 0.15:
-            patterns['sell_patterns'].append({
-                'rule': "SELL at VWAP +3σ band (extreme deviation)",
-                'confidence': len(sell_at_vwap_3sd) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # Combined VWAP band patterns with other market structure
-        sell_vwap_band_1_or_2 = sell_trades[(sell_trades['in_vwap_band_1'] == True) | (sell_trades['in_vwap_band_2'] == True)]
-        if len(sell_vwap_band_1_or_2) > 0:
-            # Band 1/2 + Swing High
-            sell_vwap_plus_swing = sell_vwap_band_1_or_2[sell_vwap_band_1_or_2['at_swing_high'] == True]
-            if len(sell_vwap_plus_swing) > len(sell_trades) * 0.15:
-                patterns['sell_patterns'].append({
-                    'rule': "🎯 SELL at VWAP Band 1/2 + SWING HIGH (high probability)",
-                    'confidence': len(sell_vwap_plus_swing) / len(sell_trades),
-                    'sample_size': len(sell_trades)
-                })
-
-            # Band 1/2 + Order Block
-            sell_vwap_plus_ob = sell_vwap_band_1_or_2[sell_vwap_band_1_or_2['order_block_bearish'] == True]
-            if len(sell_vwap_plus_ob) > len(sell_trades) * 0.1:
-                patterns['sell_patterns'].append({
-                    'rule': "🎯 SELL at VWAP Band 1/2 + BEARISH ORDER BLOCK",
-                    'confidence': len(sell_vwap_plus_ob) / len(sell_trades),
-                    'sample_size': len(sell_trades)
-                })
+        sell_counts = flag_counts.loc['sell']
+        above_vwap = flags['above_vwap_entry'].to_numpy()[is_sell]
+        avg_distance = sell_trades['vwap_distance_pct'][above_vwap].mean()
 
-            # Band 1/2 + Above VAH
-            sell_vwap_plus_vah = sell_vwap_band_1_or_2[sell_vwap_band_1_or_2['above_vah'] == True]
-            if len(sell_vwap_plus_vah) > len(sell_trades) * 0.1:
+        for column, min_share, rule in SELL_FLAG_RULES:
+            count = sell_counts[column]
+            if count > num_sells * min_share:
                 patterns['sell_patterns'].append({
-                    'rule': "🎯 SELL at VWAP Band 1/2 + ABOVE VAH (overbought)",
-                    'confidence': len(sell_vwap_plus_vah) / len(sell_trades),
-                    'sample_size': len(sell_trades)
+                    'rule': rule.format(avg_distance=avg_distance),
+                    'confidence': count / num_sells,
+                    'sample_size': num_sells
                 })
 
-        # Volume Profile patterns
-        sell_at_poc = sell_trades[sell_trades['at_poc'] == True]
-        if len(sell_at_poc) > len(sell_trades) * 0.3:
-            patterns['sell_patterns'].append({
-                'rule': "SELL at Volume Profile POC (high volume node)",
-                'confidence': len(sell_at_poc) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        sell_above_vah = sell_trades[sell_trades['above_vah'] == True]
-        if len(sell_above_vah) > len(sell_trades) * 0.4:
-            patterns['sell_patterns'].append({
-                'rule': "SELL above Value Area High (VAH) - bullish extension reversal",
-                'confidence': len(sell_above_vah) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # High volume area patterns
-        sell_high_vol = sell_trades[sell_trades['high_volume_area'] == True]
-        if len(sell_high_vol) > len(sell_trades) * 0.4:
-            patterns['sell_patterns'].append({
-                'rule': "SELL at high volume bars",
-                'confidence': len(sell_high_vol) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # Order block patterns
-        sell_at_bearish_ob = sell_trades[sell_trades['order_block_bearish'] == True]
-        if len(sell_at_bearish_ob) > len(sell_trades) * 0.3:
-            patterns['sell_patterns'].append({
-                'rule': "SELL at bearish order blocks (institutional zones)",
-                'confidence': len(sell_at_bearish_ob) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # Liquidity sweep patterns
-        sell_after_sweep = sell_trades[sell_trades['liquidity_sweep'] == True]
-        if len(sell_after_sweep) > len(sell_trades) * 0.2:
-            patterns['sell_patterns'].append({
-                'rule': "SELL after liquidity sweep (stop hunt reversal)",
-                'confidence': len(sell_after_sweep) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
-        # Fair value gap patterns
-        sell_in_fvg = sell_trades[sell_trades['fair_value_gap_down'] == True]
-        if len(sell_in_fvg) > len(sell_trades) * 0.25:
-            patterns['sell_patterns'].append({
-                'rule': "SELL in bearish FVG (filling price gap)",
-                'confidence': len(sell_in_fvg) / len(sell_trades),
-                'sample_size': len(sell_trades)
-            })
-
     return patterns
 
 
-def analyze_price_behavior_at_level(all_trades_conditions, market_data_df, level_field, level_name):
+def analyze_price_behavior_at_level(all_trades_conditions, market_data_df, level_field, level_name, at_level=None):
     """
     UNIVERSAL price behavior analysis for ANY level
     Analyzes if price continues through or reverses at a given level
@@ -881,11 +1062,13 @@ def analyze_price_behavior_at_level(all_trades_conditions, market_data_df, level
     Args:
         level_field: The field name to check (e.g., 'at_poc', 'at_lvn', 'in_vwap_band_1')
         level_name: Display name for the level (e.g., 'POC', 'LVN', 'VWAP Band 1')
+        at_level: Optional boolean array of the trades at the level (read
+            from level_field when not given)
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
-    df = pd.DataFrame(all_trades_conditions)
+    df = conditions_to_dataframe(all_trades_conditions)
 
     analysis = {
         'total_trades': len(df),
@@ -898,64 +1081,54 @@ def analyze_price_behavior_at_level(all_trades_conditions, market_data_df, level
     }
 
     # Analyze trades at this level
-    trades_at_level = df[df[level_field] == True]
+    if at_level is None:
+        at_level = df[level_field].to_numpy() == True
+    trades_at_level = df[at_level]
     analysis['trades_at_level'] = len(trades_at_level)
 
     if len(trades_at_level) > 0:
         analysis['buy_at_level'] = len(trades_at_level[trades_at_level['trade_type'] == 'buy'])
         analysis['sell_at_level'] = len(trades_at_level[trades_at_level['trade_type'] == 'sell'])
 
-        # Analyze price reaction after hitting level
-        for _, trade in trades_at_level.iterrows():
-            entry_time = pd.to_datetime(trade['entry_time'])
-            entry_price = trade['entry_price']
-            trade_type = trade['trade_type']
-
-            # Look at next 5-10 bars to see if price continued or reversed
-            try:
-                if entry_time in market_data_df.index:
-                    bar_idx = market_data_df.index.get_loc(entry_time)
-                    if bar_idx < len(market_data_df) - 10:
-                        next_bars = market_data_df.iloc[bar_idx+1:bar_idx+11]
-
-                        # Calculate price movement
-                        price_change = (next_bars['close'].iloc[-1] - entry_price) / entry_price * 100
-
-                        # Determine if continuation or reversal
-                        if trade_type == 'buy':
-                            # For buy, continuation = price went up, reversal = price went down
-                            if price_change > 0.1:
-                                analysis['continuation'] += 1
-                                reaction = 'continuation_up'
-                            elif price_change < -0.1:
-                                analysis['reversal'] += 1
-                                reaction = 'reversal_down'
-                            else:
-                                reaction = 'neutral'
-                        else:  # sell
-                            # For sell, continuation = price went down, reversal = price went up
-                            if price_change < -0.1:
-                                analysis['continuation'] += 1
-                                reaction = 'continuation_down'
-                            elif price_change > 0.1:
-                                analysis['reversal'] += 1
-                                reaction = 'reversal_up'
-                            else:
-                                reaction = 'neutral'
-
-                        analysis['reactions'].append({
-                            'entry_time': entry_time,
-                            'entry_price': entry_price,
-                            'trade_type': trade_type,
-                            'price_change_pct': price_change,
-                            'reaction': reaction,
-                            'level_name': level_name
-                        })
-            except Exception as e:
-                pass  # Skip if there's any issue with this trade
+        # Analyze price reaction after hitting level: the close 10 bars after
+        # the entry bar, for trades entered exactly on a bar with 10 bars after it
+        entry_times = pd.to_datetime(trades_at_level['entry_time'])
+        bar_idx = market_data_df.index.get_indexer(entry_times)
+        closes = market_data_df['close'].to_numpy()
+        has_next_bars = (bar_idx >= 0) & (bar_idx < len(closes) - 10)
+
+        entry_prices = trades_at_level['entry_price'].to_numpy()[has_next_bars]
+        trade_types = trades_at_level['trade_type'].to_numpy()[has_next_bars]
+
+        # Calculate price movement
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change = (closes[bar_idx[has_next_bars] + 10] - entry_prices) / entry_prices * 100
+
+        # For buy, continuation = price went up, reversal = price went down
+        # For sell, continuation = price went down, reversal = price went up
+        is_buy = trade_types == 'buy'
+        went_up = price_change > 0.1
+        went_down = price_change < -0.1
+
+        analysis['continuation'] = int(np.count_nonzero(np.where(is_buy, went_up, went_down)))
+        analysis['reversal'] = int(np.count_nonzero(np.where(is_buy, went_down, went_up)))
+
+        reaction = np.select(
+            [is_buy & went_up, is_buy & went_down, ~is_buy & went_down, ~is_buy & went_up],
+            ['continuation_up', 'reversal_down', 'continuation_down', 'reversal_up'],
+            default='neutral'
+        )
 
-    return analysis
+        analysis['reactions'] = pd.DataFrame({
+            'entry_time': entry_times[has_next_bars].to_numpy(),
+            'entry_price': entry_prices,
+            'trade_type': trade_types,
+            'price_change_pct': price_change,
+            'reaction': reaction,
+            'level_name': level_name
+        }).to_dict('records')
 
+    return analysis
 
 def analyze_all_level_reactions(all_trades_conditions, market_data_df):
     """
@@ -966,11 +1139,15 @@ def analyze_all_level_reactions(all_trades_conditions, market_data_df):
     - Order Blocks (Bullish/Bearish)
     - LVN
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
+    df = conditions_to_dataframe(all_trades_conditions)
     all_reactions = {}
 
+    # Every level flag packed once - each level below is one AND over the bitmask
+    flags = pack_condition_flags(df)
+
     # Define all levels to analyze
     levels_to_analyze = [
         ('at_poc', 'POC (Point of Control)'),
@@ -987,16 +1164,18 @@ def analyze_all_level_reactions(all_trades_conditions, market_data_df):
     ]
 
     for level_field, level_name in levels_to_analyze:
-        analysis = analyze_price_behavior_at_level(
-            all_trades_conditions,
+        at_level = (flags & CONDITION_FLAG_BITS[level_field]) != 0
+        if not at_level.any():
+            continue
+
+        all_reactions[level_name] = analyze_price_behavior_at_level(
+            df,
             market_data_df,
             level_field,
-            level_name
+            level_name,
+            at_level=at_level
         )
 
-        if analysis and analysis['trades_at_level'] > 0:
-            all_reactions[level_name] = analysis
-
     return all_reactions
 
 
@@ -1004,10 +1183,10 @@ def analyze_entry_times(all_trades_conditions):
     """
     Analyze what times the EA prefers to enter trades
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
-    df = pd.DataFrame(all_trades_conditions)
+    df = conditions_to_dataframe(all_trades_conditions).copy()
 
     time_analysis = {
         'total_trades': len(df),
@@ -1018,9 +1197,10 @@ def analyze_entry_times(all_trades_conditions):
         'session_distribution': {}
     }
 
-    # Extract hour and day of week
-    df['hour'] = pd.to_datetime(df['entry_time']).dt.hour
-    df['day_of_week'] = pd.to_datetime(df['entry_time']).dt.day_name()
+    # Extract hour and day of week (entry times parsed once)
+    entry_times = pd.to_datetime(df['entry_time'])
+    df['hour'] = entry_times.dt.hour
+    df['day_of_week'] = entry_times.dt.day_name()
 
     # Hourly distribution
     hourly_counts = df['hour'].value_counts().sort_index()
@@ -1048,16 +1228,11 @@ def analyze_entry_times(all_trades_conditions):
         }
 
     # Trading session distribution (approximate)
-    def get_session(hour):
-        if 0 <= hour < 8:
-            return 'Asian'
-        elif 8 <= hour < 16:
-            return 'London'
-        elif 16 <= hour < 24:
-            return 'New York'
-        return 'Unknown'
-
-    df['session'] = df['hour'].apply(get_session)
+    df['session'] = np.select(
+        [df['hour'] < 8, df['hour'] < 16, df['hour'] < 24],
+        ['Asian', 'London', 'New York'],
+        default='Unknown'
+    )
     session_counts = df['session'].value_counts()
     for session, count in session_counts.items():
         time_analysis['session_distribution'][session] = {
@@ -1072,10 +1247,10 @@ def analyze_vwap_mean_reversion(all_trades_conditions):
     """
     Dedicated VWAP bands 1 & 2 mean reversion analysis
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
-    df = pd.DataFrame(all_trades_conditions)
+    df = conditions_to_dataframe(all_trades_conditions)
 
     vwap_analysis = {
         'total_trades': len(df),
@@ -1092,44 +1267,45 @@ def analyze_vwap_mean_reversion(all_trades_conditions):
         'avg_deviation_band_2': 0
     }
 
-    # Count trades at each band
-    band_1_trades = df[df['in_vwap_band_1'] == True]
-    band_2_trades = df[df['in_vwap_band_2'] == True]
-    band_3_trades = df[df['in_vwap_band_3'] == True]
-    band_1_2_trades = df[(df['in_vwap_band_1'] == True) | (df['in_vwap_band_2'] == True)]
+    # Count trades at each band - flags packed into one bitmask, so every
+    # count below is an AND over a single array, not a DataFrame filter
+    flags = pack_condition_flags(df)
+    band_1 = (flags & CONDITION_FLAG_BITS['in_vwap_band_1']) != 0
+    band_2 = (flags & CONDITION_FLAG_BITS['in_vwap_band_2']) != 0
+    band_3 = (flags & CONDITION_FLAG_BITS['in_vwap_band_3']) != 0
+    band_1_2 = (flags & (CONDITION_FLAG_BITS['in_vwap_band_1'] | CONDITION_FLAG_BITS['in_vwap_band_2'])) != 0
 
-    vwap_analysis['band_1_trades'] = len(band_1_trades)
-    vwap_analysis['band_2_trades'] = len(band_2_trades)
-    vwap_analysis['band_3_trades'] = len(band_3_trades)
-    vwap_analysis['band_1_2_trades'] = len(band_1_2_trades)
-    vwap_analysis['band_1_2_percentage'] = (len(band_1_2_trades) / len(df) * 100) if len(df) > 0 else 0
+    vwap_analysis['band_1_trades'] = np.count_nonzero(band_1)
+    vwap_analysis['band_2_trades'] = np.count_nonzero(band_2)
+    vwap_analysis['band_3_trades'] = np.count_nonzero(band_3)
+    vwap_analysis['band_1_2_trades'] = np.count_nonzero(band_1_2)
+    vwap_analysis['band_1_2_percentage'] = (vwap_analysis['band_1_2_trades'] / len(df) * 100) if len(df) > 0 else 0
 
     # Buy/Sell breakdown for bands 1 & 2
-    buy_trades = df[df['trade_type'] == 'buy']
-    sell_trades = df[df['trade_type'] == 'sell']
+    is_buy = df['trade_type'].to_numpy() == 'buy'
+    is_sell = df['trade_type'].to_numpy() == 'sell'
 
-    vwap_analysis['buy_band_1'] = len(buy_trades[buy_trades['in_vwap_band_1'] == True])
-    vwap_analysis['buy_band_2'] = len(buy_trades[buy_trades['in_vwap_band_2'] == True])
-    vwap_analysis['sell_band_1'] = len(sell_trades[sell_trades['in_vwap_band_1'] == True])
-    vwap_analysis['sell_band_2'] = len(sell_trades[sell_trades['in_vwap_band_2'] == True])
+    vwap_analysis['buy_band_1'] = np.count_nonzero(is_buy & band_1)
+    vwap_analysis['buy_band_2'] = np.count_nonzero(is_buy & band_2)
+    vwap_analysis['sell_band_1'] = np.count_nonzero(is_sell & band_1)
+    vwap_analysis['sell_band_2'] = np.count_nonzero(is_sell & band_2)
 
     # Average deviation distance for bands 1 & 2
-    if len(band_1_trades) > 0:
-        vwap_analysis['avg_deviation_band_1'] = band_1_trades['vwap_distance_pct'].mean()
-    if len(band_2_trades) > 0:
-        vwap_analysis['avg_deviation_band_2'] = band_2_trades['vwap_distance_pct'].mean()
+    if vwap_analysis['band_1_trades'] > 0:
+        vwap_analysis['avg_deviation_band_1'] = df['vwap_distance_pct'][band_1].mean()
+    if vwap_analysis['band_2_trades'] > 0:
+        vwap_analysis['avg_deviation_band_2'] = df['vwap_distance_pct'][band_2].mean()
 
     # Combined patterns for bands 1 & 2
-    vwap_analysis['band_1_2_at_swing'] = len(band_1_2_trades[
-        (band_1_2_trades['at_swing_low'] == True) | (band_1_2_trades['at_swing_high'] == True)
-    ])
-    vwap_analysis['band_1_2_at_order_blocks'] = len(band_1_2_trades[
-        (band_1_2_trades['order_block_bullish'] == True) | (band_1_2_trades['order_block_bearish'] == True)
-    ])
-    vwap_analysis['band_1_2_at_poc'] = len(band_1_2_trades[band_1_2_trades['at_poc'] == True])
-    vwap_analysis['band_1_2_outside_value_area'] = len(band_1_2_trades[
-        (band_1_2_trades['below_val'] == True) | (band_1_2_trades['above_vah'] == True)
-    ])
+    band_1_2_flags = flags[band_1_2]
+    swing_bits = CONDITION_FLAG_BITS['at_swing_low'] | CONDITION_FLAG_BITS['at_swing_high']
+    order_block_bits = CONDITION_FLAG_BITS['order_block_bullish'] | CONDITION_FLAG_BITS['order_block_bearish']
+    outside_value_area_bits = CONDITION_FLAG_BITS['below_val'] | CONDITION_FLAG_BITS['above_vah']
+
+    vwap_analysis['band_1_2_at_swing'] = np.count_nonzero(band_1_2_flags & swing_bits)
+    vwap_analysis['band_1_2_at_order_blocks'] = np.count_nonzero(band_1_2_flags & order_block_bits)
+    vwap_analysis['band_1_2_at_poc'] = np.count_nonzero(band_1_2_flags & CONDITION_FLAG_BITS['at_poc'])
+    vwap_analysis['band_1_2_outside_value_area'] = np.count_nonzero(band_1_2_flags & outside_value_area_bits)
 
     return vwap_analysis
 
@@ -1139,10 +1315,10 @@ def create_previous_daily_values_dataset(all_trades_conditions, market_data_df):
     Create separate dataset showing if previous daily values (POC, VAH, VAL, VWAP, LVN)
     are used as entry levels
     """
-    if not all_trades_conditions:
+    if len(all_trades_conditions) == 0:
         return {}
 
-    df = pd.DataFrame(all_trades_conditions)
+    df = conditions_to_dataframe(all_trades_conditions)
 
     previous_day_analysis = {
         'total_trades_analyzed': len(df),
@@ -1156,27 +1332,10 @@ def create_previous_daily_values_dataset(all_trades_conditions, market_data_df):
 
     # Calculate daily values for each trading day
     market_data_df['date'] = market_data_df.index.date
+    day_positions = market_data_df.groupby('date').indices
 
-    for _, trade in df.iterrows():
-        entry_time = pd.to_datetime(trade['entry_time'])
-        entry_price = trade['entry_price']
-        entry_date = entry_time.date()
-
-        # Get previous day's data
-        prev_date = entry_date - timedelta(days=1)
-
-        # Handle weekends - go back further if needed
-        max_lookback = 5
-        for i in range(max_lookback):
-            prev_day_data = market_data_df[market_data_df['date'] == prev_date]
-            if not prev_day_data.empty:
-                break
-            prev_date = prev_date - timedelta(days=1)
-
-        if prev_day_data.empty:
-            continue
-
-        # Calculate previous day's POC, VAH, VAL, VWAP, LVN
+    def calculate_day_levels(prev_day_data):
+        """Previous day's POC, VAH, VAL, VWAP, LVN (None where unavailable)"""
         prev_poc = None
         prev_vah = None
         prev_val = None
@@ -1192,47 +1351,30 @@ def create_previous_daily_values_dataset(all_trades_conditions, market_data_df):
             if price_range > 0:
                 num_bins = 50
                 bin_size = price_range / num_bins
-                volume_at_price = {}
 
-                for _, candle in prev_day_data.iterrows():
-                    candle_low = candle['low']
-                    candle_high = candle['high']
-                    candle_volume = candle.get('tick_volume', 0)
+                if 'tick_volume' in prev_day_data.columns:
+                    prev_volumes = prev_day_data['tick_volume'].to_numpy(dtype=float)
+                else:
+                    prev_volumes = np.zeros(len(prev_day_data))
 
-                    low_bin = int((candle_low - price_min) / bin_size)
-                    high_bin = int((candle_high - price_min) / bin_size)
-                    bins_covered = max(1, high_bin - low_bin + 1)
-                    volume_per_bin = candle_volume / bins_covered
+                profile_levels = summarize_volume_profile(*build_volume_profile(
+                    prev_day_data['low'].to_numpy(dtype=float),
+                    prev_day_data['high'].to_numpy(dtype=float),
+                    prev_volumes,
+                    price_min, bin_size, num_bins
+                ))
 
-                    for bin_idx in range(low_bin, high_bin + 1):
-                        if 0 <= bin_idx < num_bins:
-                            if bin_idx not in volume_at_price:
-                                volume_at_price[bin_idx] = 0
-                            volume_at_price[bin_idx] += volume_per_bin
+                if profile_levels is not None:
+                    poc_bin, vah_bin, val_bin, lvn_bin, _ = profile_levels
 
-                if volume_at_price:
                     # POC
-                    poc_bin = max(volume_at_price, key=volume_at_price.get)
                     prev_poc = price_min + (poc_bin * bin_size) + (bin_size / 2)
 
                     # VAH/VAL
-                    total_volume = sum(volume_at_price.values())
-                    target_volume = total_volume * 0.70
-                    sorted_bins = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)
-                    accumulated_volume = 0
-                    value_area_bins = []
-                    for bin_idx, vol in sorted_bins:
-                        value_area_bins.append(bin_idx)
-                        accumulated_volume += vol
-                        if accumulated_volume >= target_volume:
-                            break
-
-                    if value_area_bins:
-                        prev_vah = price_min + (max(value_area_bins) * bin_size) + bin_size
-                        prev_val = price_min + (min(value_area_bins) * bin_size)
+                    prev_vah = price_min + (vah_bin * bin_size) + bin_size
+                    prev_val = price_min + (val_bin * bin_size)
 
                     # LVN
-                    lvn_bin = min(volume_at_price, key=volume_at_price.get)
                     prev_lvn = price_min + (lvn_bin * bin_size) + (bin_size / 2)
 
                 # VWAP
@@ -1241,6 +1383,37 @@ def create_previous_daily_values_dataset(all_trades_conditions, market_data_df):
         except Exception as e:
             pass
 
+        return prev_poc, prev_vah, prev_val, prev_vwap, prev_lvn
+
+    # Levels per previous day - trades entered after the same day share them
+    daily_levels = {}
+
+    # Parse every entry time in one pass
+    entry_times = pd.to_datetime(df['entry_time'])
+
+    for (_, trade), entry_time in zip(df.iterrows(), entry_times):
+        entry_price = trade['entry_price']
+        entry_date = entry_time.date()
+
+        # Get previous day's data
+        prev_date = entry_date - timedelta(days=1)
+
+        # Handle weekends - go back further if needed
+        max_lookback = 5
+        for i in range(max_lookback):
+            prev_positions = day_positions.get(prev_date)
+            if prev_positions is not None:
+                break
+            prev_date = prev_date - timedelta(days=1)
+
+        if prev_positions is None:
+            continue
+
+        # Calculate previous day's POC, VAH, VAL, VWAP, LVN
+        if prev_date not in daily_levels:
+            daily_levels[prev_date] = calculate_day_levels(market_data_df.iloc[prev_positions])
+        prev_poc, prev_vah, prev_val, prev_vwap, prev_lvn = daily_levels[prev_date]
+
         # Check if entry price is near any previous day levels
         tolerance = entry_price * 0.003  # 0.3% tolerance
 
@@ -1298,66 +1471,53 @@ def analyze_counter_trend_duration(trades_df, market_data_df):
         'examples': []
     }
 
-    # Detect trend at entry and analyze duration
-    counter_trend_durations = []
-
-    for _, trade in trades_df.iterrows():
-        entry_time = pd.to_datetime(trade.get('entry_time'))
-        exit_time = pd.to_datetime(trade.get('exit_time'))
-        trade_type = trade.get('trade_type', 'unknown')
-
-        if pd.isna(exit_time):
-            continue
-
-        # Get market trend at entry
-        if entry_time in market_data_df.index:
-            bar = market_data_df.loc[entry_time]
-            trend_direction = bar.get('trend_direction', 'neutral')
-
-            # Determine if counter-trend
-            is_counter_trend = False
-            if trade_type == 'buy' and trend_direction == 'downtrend':
-                is_counter_trend = True
-            elif trade_type == 'sell' and trend_direction == 'uptrend':
-                is_counter_trend = True
-
-            if is_counter_trend:
-                duration_minutes = (exit_time - entry_time).total_seconds() / 60
-                counter_trend_durations.append(duration_minutes)
-
-                duration_analysis['examples'].append({
-                    'entry_time': entry_time,
-                    'exit_time': exit_time,
-                    'duration_minutes': duration_minutes,
-                    'duration_hours': duration_minutes / 60,
-                    'trade_type': trade_type,
-                    'trend_direction': trend_direction,
-                    'entry_price': trade.get('entry_price'),
-                    'exit_price': trade.get('exit_price'),
-                    'profit': trade.get('profit')
-                })
-
-    if counter_trend_durations:
+    # Detect trend at entry and analyze duration - every trade's entry bar
+    # is found with one index lookup instead of a .loc per trade
+    entry_times = pd.to_datetime(trades_df['entry_time'])
+    exit_times = pd.to_datetime(trades_df['exit_time'])
+    trade_types = trades_df['trade_type'].to_numpy()
+
+    # Get market trend at entry (trades entered exactly on a bar)
+    bar_idx = market_data_df.index.get_indexer(entry_times)
+    on_bar = bar_idx >= 0
+    trend_direction = np.full(len(trades_df), 'neutral', dtype=object)
+    if 'trend_direction' in market_data_df.columns:
+        trend_direction[on_bar] = market_data_df['trend_direction'].to_numpy()[bar_idx[on_bar]]
+
+    # Determine if counter-trend (closed trades only)
+    is_counter_trend = exit_times.notna().to_numpy() & on_bar & (
+        ((trade_types == 'buy') & (trend_direction == 'downtrend')) |
+        ((trade_types == 'sell') & (trend_direction == 'uptrend'))
+    )
+
+    duration_minutes = (exit_times - entry_times).dt.total_seconds().to_numpy() / 60
+    counter_trend_durations = duration_minutes[is_counter_trend]
+
+    duration_analysis['examples'] = pd.DataFrame({
+        'entry_time': entry_times.to_numpy()[is_counter_trend],
+        'exit_time': exit_times.to_numpy()[is_counter_trend],
+        'duration_minutes': counter_trend_durations,
+        'duration_hours': counter_trend_durations / 60,
+        'trade_type': trade_types[is_counter_trend],
+        'trend_direction': trend_direction[is_counter_trend],
+        'entry_price': trades_df['entry_price'].to_numpy()[is_counter_trend],
+        'exit_price': trades_df['exit_price'].to_numpy()[is_counter_trend],
+        'profit': trades_df['profit'].to_numpy()[is_counter_trend]
+    }).to_dict('records')
+
+    if len(counter_trend_durations) > 0:
         duration_analysis['total_counter_trend_trades'] = len(counter_trend_durations)
         duration_analysis['avg_duration_minutes'] = np.mean(counter_trend_durations)
         duration_analysis['min_duration_minutes'] = np.min(counter_trend_durations)
         duration_analysis['max_duration_minutes'] = np.max(counter_trend_durations)
 
         # Duration distribution (bucketed)
-        for minutes in counter_trend_durations:
-            hours = minutes / 60
-            if hours < 1:
-                bucket = '< 1 hour'
-            elif hours < 4:
-                bucket = '1-4 hours'
-            elif hours < 12:
-                bucket = '4-12 hours'
-            elif hours < 24:
-                bucket = '12-24 hours'
-            else:
-                bucket = '> 24 hours'
-
-            duration_analysis['duration_distribution'].append(bucket)
+        hours = counter_trend_durations / 60
+        duration_analysis['duration_distribution'] = np.select(
+            [hours < 1, hours < 4, hours < 12, hours < 24],
+            ['< 1 hour', '1-4 hours', '4-12 hours', '12-24 hours'],
+            default='> 24 hours'
+        ).tolist()
 
     return duration_analysis
 
@@ -1384,71 +1544,87 @@ def analyze_hedging_and_recovery(trades_df):
     trades_df = trades_df.sort_values('entry_time').copy()
 
     # Detect simultaneous opposite positions (hedging) WITH TRIGGER ANALYSIS
-    for i, trade1 in trades_df.iterrows():
-        # Check if there are opposite direction trades within 5 minutes
-        time_window_start = pd.to_datetime(trade1.get('entry_time')) - pd.Timedelta(minutes=5)
-        time_window_end = pd.to_datetime(trade1.get('entry_time')) + pd.Timedelta(minutes=5)
-
-        nearby_trades = trades_df[
-            (pd.to_datetime(trades_df['entry_time']) >= time_window_start) &
-            (pd.to_datetime(trades_df['entry_time']) <= time_window_end) &
-            (trades_df['symbol'] == trade1.get('symbol', ''))
-        ]
-
-        # Check for opposite direction
-        if trade1.get('trade_type') == 'buy':
-            opposite_trades = nearby_trades[nearby_trades['trade_type'] == 'sell']
-        else:
-            opposite_trades = nearby_trades[nearby_trades['trade_type'] == 'buy']
-
-        if len(opposite_trades) > 0:
-            recovery_analysis['hedge_detected'] = True
-            recovery_analysis['hedge_pairs'] += 1
-
-            hedge_trade = opposite_trades.iloc[0]
-            time_diff_minutes = (pd.to_datetime(hedge_trade.get('entry_time')) -
-                                pd.to_datetime(trade1.get('entry_time'))).total_seconds() / 60
-
-            # Calculate price movement and potential drawdown trigger
-            entry_price1 = trade1.get('entry_price', 0)
-            entry_price_hedge = hedge_trade.get('entry_price', 0)
-
-            if entry_price1 > 0:
-                if trade1.get('trade_type') == 'buy':
-                    # For BUY, negative movement = drawdown
-                    price_movement_pips = (entry_price_hedge - entry_price1) * 10000
-                else:
-                    # For SELL, positive movement = drawdown
-                    price_movement_pips = (entry_price1 - entry_price_hedge) * 10000
-
-                price_movement_pct = abs(entry_price_hedge - entry_price1) / entry_price1 * 100
-            else:
-                price_movement_pips = 0
-                price_movement_pct = 0
-
-            recovery_analysis['hedge_timing'].append({
-                'time_diff': time_diff_minutes,
-                'original_type': trade1.get('trade_type', 'unknown'),
-                'hedge_type': hedge_trade.get('trade_type', 'unknown'),
-                'volume_ratio': hedge_trade.get('volume', 0) / trade1.get('volume', 1) if trade1.get('volume', 0) > 0 else 0
-            })
-
-            # Detailed hedge trigger analysis
-            recovery_analysis['hedge_triggers'].append({
-                'original_entry': entry_price1,
-                'hedge_entry': entry_price_hedge,
-                'time_before_hedge_minutes': abs(time_diff_minutes),
-                'price_movement_pips': price_movement_pips,
-                'price_movement_pct': price_movement_pct,
-                'original_volume': trade1.get('volume', 0),
-                'hedge_volume': hedge_trade.get('volume', 0),
-                'volume_multiplier': hedge_trade.get('volume', 0) / trade1.get('volume', 1) if trade1.get('volume', 0) > 0 else 0,
-                'original_exit': trade1.get('exit_price'),
-                'hedge_exit': hedge_trade.get('exit_price'),
-                'original_profit': trade1.get('profit'),
-                'hedge_profit': hedge_trade.get('profit'),
-                'net_result': (trade1.get('profit', 0) or 0) + (hedge_trade.get('profit', 0) or 0)
-            })
+    # Each trade is paired with the first opposite direction trade on the same
+    # symbol opened within 5 minutes either side of it. merge_asof searches
+    # forward from 5 minutes before the entry, so the tolerance spans the
+    # whole 10 minute window.
+    entry_dt = pd.to_datetime(trades_df['entry_time'])
+    trades_df['entry_dt'] = entry_dt
+    hedge_window = pd.Timedelta(minutes=5)
+
+    originals = pd.DataFrame({
+        'position': np.arange(len(trades_df)),
+        'symbol': trades_df['symbol'].to_numpy(),
+        'hedge_type': np.where(trades_df['trade_type'] == 'buy', 'sell', 'buy'),
+        'window_start': entry_dt.to_numpy() - hedge_window,
+        'entry_dt': entry_dt.to_numpy(),
+        'trade_type': trades_df['trade_type'].to_numpy(),
+        'entry_price': trades_df['entry_price'].to_numpy(),
+        'volume': trades_df['volume'].to_numpy(),
+        'exit_price': trades_df['exit_price'].to_numpy(),
+        'profit': trades_df['profit'].to_numpy()
+    })
+    candidates = originals.drop(columns=['position', 'hedge_type', 'window_start'])
+    candidates['hedge_type'] = candidates['trade_type']
+
+    originals = originals.dropna(subset=['symbol', 'window_start']).sort_values('window_start', kind='stable')
+    candidates = candidates.dropna(subset=['symbol', 'entry_dt']).sort_values('entry_dt', kind='stable')
+
+    pairs = pd.merge_asof(
+        originals, candidates,
+        left_on='window_start', right_on='entry_dt',
+        by=['symbol', 'hedge_type'],
+        direction='forward',
+        tolerance=2 * hedge_window,
+        suffixes=('', '_hedge')
+    )
+    pairs = pairs[pairs['entry_dt_hedge'].notna()].sort_values('position')
+
+    if len(pairs) > 0:
+        recovery_analysis['hedge_detected'] = True
+        recovery_analysis['hedge_pairs'] = len(pairs)
+
+        entry_price1 = pairs['entry_price'].to_numpy(dtype=float)
+        entry_price_hedge = pairs['entry_price_hedge'].to_numpy(dtype=float)
+        volume1 = pairs['volume'].to_numpy(dtype=float)
+        has_price = entry_price1 > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # For BUY, negative movement = drawdown; for SELL, positive movement = drawdown
+            price_movement_pips = np.where(
+                pairs['trade_type'].to_numpy() == 'buy',
+                (entry_price_hedge - entry_price1) * 10000,
+                (entry_price1 - entry_price_hedge) * 10000
+            )
+            price_movement_pct = np.abs(entry_price_hedge - entry_price1) / entry_price1 * 100
+            volume_ratio = np.where(volume1 > 0, pairs['volume_hedge'].to_numpy(dtype=float) / volume1, 0)
+
+        time_diff_minutes = (pairs['entry_dt_hedge'] - pairs['entry_dt']).dt.total_seconds().to_numpy() / 60
+
+        recovery_analysis['hedge_timing'] = pd.DataFrame({
+            'time_diff': time_diff_minutes,
+            'original_type': pairs['trade_type'].to_numpy(),
+            'hedge_type': pairs['trade_type_hedge'].to_numpy(),
+            'volume_ratio': volume_ratio
+        }).to_dict('records')
+
+        # Detailed hedge trigger analysis
+        recovery_analysis['hedge_triggers'] = pd.DataFrame({
+            'original_entry': entry_price1,
+            'hedge_entry': entry_price_hedge,
+            'time_before_hedge_minutes': np.abs(time_diff_minutes),
+            'price_movement_pips': np.where(has_price, price_movement_pips, 0),
+            'price_movement_pct': np.where(has_price, price_movement_pct, 0),
+            'original_volume': volume1,
+            'hedge_volume': pairs['volume_hedge'].to_numpy(dtype=float),
+            'volume_multiplier': volume_ratio,
+            'original_exit': pairs['exit_price'].to_numpy(),
+            'hedge_exit': pairs['exit_price_hedge'].to_numpy(),
+            'original_profit': pairs['profit'].to_numpy(),
+            'hedge_profit': pairs['profit_hedge'].to_numpy(),
+            'net_result': [(profit or 0) + (hedge_profit or 0)
+                           for profit, hedge_profit in zip(pairs['profit'], pairs['profit_hedge'])]
+        }).to_dict('records')
 
     # Analyze recovery sequences (adding to positions after losses)
     recovery_sequences = []
@@ -1466,8 +1642,7 @@ def analyze_hedging_and_recovery(trades_df):
                 prev_trade = current_sequence[-1]
 
                 # Same direction within reasonable time (1 hour)
-                time_diff = (pd.to_datetime(trade.get('entry_time')) -
-                           pd.to_datetime(prev_trade.get('entry_time'))).total_seconds() / 3600
+                time_diff = (trade['entry_dt'] - prev_trade['entry_dt']).total_seconds() / 3600
 
                 if trade.get('trade_type') == prev_trade.get('trade_type') and time_diff < 1:
                     current_sequence.append(trade)
@@ -1654,6 +1829,9 @@ def main():
         bot.stop()
         return
 
+    # Parse entry times once - every analysis below reuses the datetime column
+    trades_df['entry_time'] = pd.to_datetime(trades_df['entry_time'])
+
     # Get the most common symbol (in case there are multiple)
     symbol_counts = trades_df['symbol'].value_counts()
     symbol = symbol_counts.index[0]
@@ -1662,8 +1840,8 @@ def main():
     print(f"Fetching market data for {symbol}...")
 
     # Calculate required history based on trade date range
-    earliest_trade = pd.to_datetime(trades_df['entry_time']).min()
-    latest_trade = pd.to_datetime(trades_df['entry_time']).max()
+    earliest_trade = trades_df['entry_time'].min()
+    latest_trade = trades_df['entry_time'].max()
     days_span = (latest_trade - earliest_trade).days
 
     # Calculate required hourly bars (add 20% buffer + extra for indicators)
@@ -1715,11 +1893,11 @@ def main():
     all_conditions = []
     trades_with_trend_info = []
 
-    for idx, trade in trades_df.iterrows():
-        conditions = analyze_trade_entry_conditions(trade, market_data, market_data)
+    trade_conditions = analyze_trades_batch(trades_df, market_data, market_data)
+
+    for (idx, trade), entry_time, conditions in zip(trades_df.iterrows(), trades_df['entry_time'], trade_conditions):
 
         # Get trend info even if conditions is None
-        entry_time = pd.to_datetime(trade.get('entry_time'))
         trend_info = None
 
         if entry_time in market_data.index:
@@ -1852,12 +2030,15 @@ def main():
 
             print()
 
+    # Build the conditions table once for every analysis below
+    conditions_df = conditions_to_dataframe(all_conditions)
+
     # Find patterns
     print("\n" + "="*80)
     print("DEDUCED ENTRY RULES")
     print("="*80 + "\n")
 
-    patterns = find_trade_patterns(all_conditions)
+    patterns = find_trade_patterns(conditions_df)
 
     if patterns['buy_patterns']:
         print("BUY ENTRY CONDITIONS:")
@@ -1878,7 +2059,7 @@ def main():
     print("🎯 VWAP MEAN REVERSION ANALYSIS (BANDS 1 & 2 FOCUS)")
     print("="*80 + "\n")
 
-    vwap_stats = analyze_vwap_mean_reversion(all_conditions)
+    vwap_stats = analyze_vwap_mean_reversion(conditions_df)
 
     if vwap_stats and vwap_stats['total_trades'] > 0:
         print(f"Total Trades Analyzed: {vwap_stats['total_trades']}")
@@ -1941,7 +2122,7 @@ def main():
     print("Analyzing if price CONTINUES or REVERSES at each institutional level...")
     print()
 
-    all_level_reactions = analyze_all_level_reactions(all_conditions, market_data)
+    all_level_reactions = analyze_all_level_reactions(conditions_df, market_data)
 
     if all_level_reactions:
         # Sort by number of trades for better readability
@@ -2016,7 +2197,7 @@ def main():
     print("🕐 ENTRY TIME PATTERN ANALYSIS")
     print("="*80 + "\n")
 
-    time_stats = analyze_entry_times(all_conditions)
+    time_stats = analyze_entry_times(conditions_df)
 
     if time_stats and time_stats['total_trades'] > 0:
         print(f"Total Trades Analyzed: {time_stats['total_trades']}")
@@ -2070,7 +2251,7 @@ def main():
     print("📊 PREVIOUS DAILY VALUES AS ENTRY LEVELS")
     print("="*80 + "\n")
 
-    prev_day_stats = create_previous_daily_values_dataset(all_conditions, market_data)
+    prev_day_stats = create_previous_daily_values_dataset(conditions_df, market_data)
 
     if prev_day_stats and prev_day_stats['total_trades_analyzed'] > 0:
         print(f"Total Trades Analyzed: {prev_day_stats['total_trades_analyzed']}")
@@ -2375,8 +2556,7 @@ def main():
                         current_seq_trades.append(trade)
                     else:
                         prev_trade = current_seq_trades[-1]
-                        time_diff = (pd.to_datetime(trade.get('entry_time')) -
-                                   pd.to_datetime(prev_trade.get('entry_time'))).total_seconds() / 3600
+                        time_diff = (trade.get('entry_time') - prev_trade.get('entry_time')).total_seconds() / 3600
 
                         if trade.get('trade_type') == prev_trade.get('trade_type') and time_diff < 1:
                             current_seq_trades.append(trade)
@@ -2403,7 +2583,7 @@ def main():
                 for i, trade in enumerate(seq, 1):
                     entry_price = trade.get('entry_price', 0)
                     volume = trade.get('volume', 0)
-                    entry_time = pd.to_datetime(trade.get('entry_time'))
+                    entry_time = trade.get('entry_time')
                     exit_price = trade.get('exit_price')
                     profit = trade.get('profit')
 
@@ -2493,8 +2673,7 @@ def main():
 
     # Export detailed CSV
     if all_conditions:
-        export_df = pd.DataFrame(all_conditions)
-        export_df.to_csv('ea_reverse_engineering_detailed.csv', index=False)
+        conditions_df.to_csv('ea_reverse_engineering_detailed.csv', index=False)
         print(f"\n✅ Exported detailed analysis to: ea_reverse_engineering_detailed.csv")
 
     # TREND AVOIDANCE ANALYSIS
@@ -261,7 +261,10 @@ class DataStorage:
             # Filter DataFrame to only include columns that exist in the database
             df_filtered = df[[col for col in db_columns if col in df.columns]]
 
-            df_filtered.to_sql('historical_deals', conn, if_exists='append', index=False)
+            # to_sql runs every chunk inside one transaction with a single prepared
+            # executemany; chunking bounds the row-tuple list it builds
+            df_filtered.to_sql('historical_deals', conn, if_exists='append', index=False,
+                               chunksize=10000)
             rows_inserted = len(df_filtered)
             conn.commit()
             conn.close()
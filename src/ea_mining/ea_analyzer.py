@@ -43,8 +43,9 @@ class EAAnalyzer:
         analysis = {}
 
         # Time-based patterns
-        trades_df['hour'] = pd.to_datetime(trades_df['entry_time']).dt.hour
-        trades_df['day_of_week'] = pd.to_datetime(trades_df['entry_time']).dt.dayofweek
+        entry_times = pd.to_datetime(trades_df['entry_time']).dt
+        trades_df['hour'] = entry_times.hour
+        trades_df['day_of_week'] = entry_times.dayofweek
 
         analysis['entry_hours'] = trades_df['hour'].value_counts().to_dict()
         analysis['entry_days'] = trades_df['day_of_week'].value_counts().to_dict()
@@ -146,8 +146,9 @@ class MT5Manager:
             return None
 
         # Convert to DataFrame
+        # MT5 bar times are int64 epoch seconds, so cast them straight to datetime64
         df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df['time'] = df['time'].to_numpy().astype('datetime64[s]')
         df.set_index('time', inplace=True)
 
         # Rename columns for consistency
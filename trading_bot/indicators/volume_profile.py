@@ -8,6 +8,13 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 
+# Try to import numba for the compiled volume distribution loop
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from config.strategy_config import (
     VP_BINS,
     HVN_LEVELS,
@@ -16,6 +23,61 @@ from config.strategy_config import (
 )
 
 
+def _distribute_volume(first_bin: np.ndarray, last_bin: np.ndarray,
+                       volume: np.ndarray, num_edges: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spread each candle's volume evenly over the bin edges it covers
+
+    Args:
+        first_bin: Index of the first edge inside each candle's range
+        last_bin: One past the last edge inside each candle's range
+        volume: Volume per candle
+        num_edges: Number of bin edges
+
+    Returns:
+        Tuple of (volume per edge, edges in the order they were first touched)
+    """
+    volume_at_edge = np.zeros(num_edges)
+    touched = np.zeros(num_edges, dtype=np.bool_)
+    touch_order = np.empty(num_edges, dtype=np.int64)
+    num_touched = 0
+
+    for i in range(len(volume)):
+        count = last_bin[i] - first_bin[i]
+        if count <= 0:
+            continue
+
+        volume_per_bin = volume[i] / count
+        for b in range(first_bin[i], last_bin[i]):
+            if not touched[b]:
+                touched[b] = True
+                touch_order[num_touched] = b
+                num_touched += 1
+            volume_at_edge[b] += volume_per_bin
+
+    return volume_at_edge, touch_order[:num_touched]
+
+
+if NUMBA_AVAILABLE:
+    _distribute_volume = numba.njit(cache=True)(_distribute_volume)
+else:
+    def _distribute_volume(first_bin, last_bin, volume, num_edges):
+        """NumPy version of the volume distribution (same accumulation order)"""
+        counts = last_bin - first_bin
+        has_bins = counts > 0
+        first_bin, counts, volume = first_bin[has_bins], counts[has_bins], volume[has_bins]
+
+        # Flatten every candle's edge range in candle order, so bincount
+        # accumulates each edge's volume in the same order as the loop
+        offsets = np.cumsum(counts) - counts
+        edge_idx = np.arange(counts.sum()) - np.repeat(offsets - first_bin, counts)
+        weights = np.repeat(volume / counts, counts)
+
+        volume_at_edge = np.bincount(edge_idx, weights=weights, minlength=num_edges)
+        touched, first_seen = np.unique(edge_idx, return_index=True)
+        return volume_at_edge, touched[np.argsort(first_seen)]
+
+
 class VolumeProfile:
     """Calculate volume profile and key levels"""
 
@@ -58,32 +120,23 @@ class VolumeProfile:
         bin_size = (price_max - price_min) / self.bins
         bins = np.linspace(price_min, price_max, self.bins + 1)
 
-        # Calculate volume at each price level
-        volume_at_price = {}
-
-        for idx, row in df.iterrows():
-            # Distribute volume across the price range of the candle
-            candle_low = row['low']
-            candle_high = row['high']
-            candle_volume = row['volume']
-
-            # Find bins that overlap with this candle
-            bin_indices = np.where((bins >= candle_low) & (bins <= candle_high))[0]
-
-            if len(bin_indices) > 0:
-                # Distribute volume evenly across bins
-                volume_per_bin = candle_volume / len(bin_indices)
-
-                for bin_idx in bin_indices:
-                    if bin_idx not in volume_at_price:
-                        volume_at_price[bin_idx] = 0
-                    volume_at_price[bin_idx] += volume_per_bin
+        # Calculate volume at each price level, spreading each candle's
+        # volume evenly over the bin edges inside its low-high range
+        first_bin = np.searchsorted(bins, df['low'].to_numpy(dtype=float), side='left')
+        last_bin = np.searchsorted(bins, df['high'].to_numpy(dtype=float), side='right')
+        volume_at_edge, touch_order = _distribute_volume(
+            first_bin, last_bin, df['volume'].to_numpy(dtype=float), len(bins)
+        )
+        volume_at_price = {int(b): volume_at_edge[b] for b in touch_order}
 
         if not volume_at_price:
             return self._empty_profile()
 
+        # Volumes of the touched bins, in the same order as volume_at_price
+        touched_volumes = volume_at_edge[touch_order]
+
         # Calculate POC (Point of Control) - highest volume bin
-        poc_bin = max(volume_at_price.items(), key=lambda x: x[1])[0]
+        poc_bin = int(touch_order[np.argmax(touched_volumes)])
         poc_price = price_min + (poc_bin * bin_size) + (bin_size / 2)
 
         # Calculate Value Area (70% of volume)
@@ -123,13 +176,13 @@ class VolumeProfile:
         vah_price = price_min + (vah_bin * bin_size) + (bin_size / 2)
         val_price = price_min + (val_bin * bin_size) + (bin_size / 2)
 
-        # HVN (High Volume Nodes) - top N volume bins
-        hvn_bins = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)[:HVN_LEVELS]
-        hvn_levels = [price_min + (bin_idx * bin_size) + (bin_size / 2) for bin_idx, _ in hvn_bins]
+        # HVN (High Volume Nodes) - top N volume bins (stable sort keeps ties in first-touched order)
+        hvn_bins = touch_order[np.argsort(-touched_volumes, kind='stable')[:HVN_LEVELS]]
+        hvn_levels = [price_min + (bin_idx * bin_size) + (bin_size / 2) for bin_idx in hvn_bins.tolist()]
 
         # LVN (Low Volume Nodes) - lowest N volume bins
-        lvn_bins = sorted(volume_at_price.items(), key=lambda x: x[1])[:LVN_LEVELS]
-        lvn_levels = [price_min + (bin_idx * bin_size) + (bin_size / 2) for bin_idx, _ in lvn_bins]
+        lvn_bins = touch_order[np.argsort(touched_volumes, kind='stable')[:LVN_LEVELS]]
+        lvn_levels = [price_min + (bin_idx * bin_size) + (bin_size / 2) for bin_idx in lvn_bins.tolist()]
 
         return {
             'poc': poc_price,
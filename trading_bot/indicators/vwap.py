@@ -5,6 +5,7 @@ Primary signal used in 28-39% of discovered trades
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Tuple, Dict
 
 from config.strategy_config import VWAP_PERIOD, VWAP_BAND_MULTIPLIERS
@@ -34,68 +35,60 @@ class VWAP:
         """
         df = data.copy()
 
-        # Typical price
-        df['typical_price'] = (df['high'] + df['low'] + df['close']) / 3
+        # Rolling windows over the raw arrays (no intermediate columns)
+        typical_price = (df['high'].to_numpy(dtype=float) +
+                         df['low'].to_numpy(dtype=float) +
+                         df['close'].to_numpy(dtype=float)) / 3
+        volume = df['volume'].to_numpy(dtype=float)
 
-        # Volume-weighted typical price
-        df['vwtp'] = df['typical_price'] * df['volume']
-
-        # Rolling VWAP
-        df['vwap'] = (
-            df['vwtp'].rolling(window=self.period).sum() /
-            df['volume'].rolling(window=self.period).sum()
-        )
-
-        # Calculate standard deviation for bands
-        df['vwap_std'] = self._calculate_vwap_std(df, self.period)
+        vwap, vwap_std = self._rolling_vwap(typical_price, volume, self.period)
+        df['vwap'] = vwap
+        df['vwap_std'] = vwap_std
 
         # Create bands (±1σ, ±2σ, ±3σ)
         for multiplier in VWAP_BAND_MULTIPLIERS:
             df[f'vwap_upper_{multiplier}'] = df['vwap'] + (df['vwap_std'] * multiplier)
             df[f'vwap_lower_{multiplier}'] = df['vwap'] - (df['vwap_std'] * multiplier)
 
-        # Cleanup temporary columns
-        df.drop(['typical_price', 'vwtp'], axis=1, inplace=True)
-
         return df
 
-    def _calculate_vwap_std(self, df: pd.DataFrame, period: int) -> pd.Series:
+    def _rolling_vwap(
+        self,
+        typical_price: np.ndarray,
+        volume: np.ndarray,
+        period: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calculate volume-weighted standard deviation
+        Calculate rolling VWAP and volume-weighted standard deviation
 
         Args:
-            df: DataFrame with price and volume data
+            typical_price: Typical price per bar
+            volume: Volume per bar
             period: Rolling period
 
         Returns:
-            Series with VWAP standard deviation
+            Tuple of (vwap, vwap_std) arrays, NaN before the first full window
         """
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        volume = df['volume']
-
-        # Rolling volume-weighted variance
-        def weighted_std(prices, volumes):
-            if len(prices) == 0 or volumes.sum() == 0:
-                return 0
-
-            # Volume-weighted mean
-            weighted_mean = (prices * volumes).sum() / volumes.sum()
+        n = len(typical_price)
+        vwap = np.full(n, np.nan)
+        vwap_std = np.full(n, np.nan)
 
-            # Volume-weighted variance
-            weighted_var = ((prices - weighted_mean) ** 2 * volumes).sum() / volumes.sum()
+        if n < period:
+            return vwap, vwap_std
 
-            # Standard deviation
-            return np.sqrt(weighted_var)
+        price_windows = sliding_window_view(typical_price, period)
+        volume_windows = sliding_window_view(volume, period)
+        volume_sums = volume_windows.sum(axis=1)
 
-        # Apply rolling calculation
-        std_series = pd.Series(index=df.index, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weighted_mean = (price_windows * volume_windows).sum(axis=1) / volume_sums
+            # Volume-weighted variance around each window's own mean
+            weighted_var = ((price_windows - weighted_mean[:, None]) ** 2 * volume_windows).sum(axis=1) / volume_sums
 
-        for i in range(period - 1, len(df)):
-            window_prices = typical_price.iloc[i - period + 1:i + 1]
-            window_volumes = volume.iloc[i - period + 1:i + 1]
-            std_series.iloc[i] = weighted_std(window_prices, window_volumes)
+        vwap[period - 1:] = weighted_mean
+        vwap_std[period - 1:] = np.where(volume_sums == 0, 0, np.sqrt(weighted_var))
 
-        return std_series
+        return vwap, vwap_std
 
     def check_price_in_band(
         self,
@@ -25,6 +25,13 @@ from config.strategy_config import (
 )
 
 
+# Length of one HTF bar, used to tell when MT5 has opened a new one
+HTF_BAR_PERIODS = {
+    'D1': pd.Timedelta(days=1),
+    'W1': pd.Timedelta(weeks=1),
+}
+
+
 class ConfluenceStrategy:
     """Main trading strategy implementation"""
 
@@ -43,6 +50,7 @@ class ConfluenceStrategy:
         self.running = False
         self.last_data_refresh = {}
         self.market_data_cache = {}
+        self.htf_data_cache = {}
 
         # Statistics
         self.stats = {
@@ -153,9 +161,9 @@ class ConfluenceStrategy:
         # Calculate VWAP on H1 data
         h1_data = self.signal_detector.vwap.calculate(h1_data)
 
-        # Fetch HTF data
-        d1_data = self.mt5.get_historical_data(symbol, 'D1', bars=100)
-        w1_data = self.mt5.get_historical_data(symbol, 'W1', bars=50)
+        # Fetch HTF data (only when a new D1/W1 bar has opened)
+        d1_data = self._get_htf_data(symbol, 'D1', 100, h1_data)
+        w1_data = self._get_htf_data(symbol, 'W1', 50, h1_data)
 
         if d1_data is None or w1_data is None:
             return
@@ -170,6 +178,44 @@ class ConfluenceStrategy:
 
         self.last_data_refresh[symbol] = now
 
+    def _get_htf_data(self, symbol: str, timeframe: str, bars: int,
+                      h1_data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Get HTF bars, fetching from MT5 only when a new bar has opened
+
+        Between fetches the forming (last) bar is rolled forward from the
+        H1 bars that fall inside it, so it matches what MT5 would return.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: 'D1' or 'W1'
+            bars: Number of bars to fetch
+            h1_data: Freshly fetched H1 data for the symbol
+
+        Returns:
+            DataFrame with HTF OHLCV data or None
+        """
+        key = (symbol, timeframe)
+        cached = self.htf_data_cache.get(key)
+        latest_h1 = h1_data.index[-1]
+
+        if cached is None or latest_h1 >= cached.index[-1] + HTF_BAR_PERIODS[timeframe]:
+            data = self.mt5.get_historical_data(symbol, timeframe, bars=bars)
+            if data is not None:
+                self.htf_data_cache[key] = data
+            return data
+
+        # Update the forming bar from H1 bars since it opened
+        bar_open = cached.index[-1]
+        forming = h1_data.loc[bar_open:]
+        cached.loc[bar_open, ['high', 'low', 'close', 'volume']] = [
+            forming['high'].max(),
+            forming['low'].min(),
+            forming['close'].iloc[-1],
+            forming['volume'].sum(),
+        ]
+        return cached
+
     def _manage_positions(self, symbol: str):
         """Manage existing positions for symbol"""
         positions = self.mt5.get_positions(symbol)
@@ -22,6 +22,34 @@ from config.strategy_config import (
     ALLOW_WEAK_TRENDS
 )
 
+# Two days of hours, so a session crossing midnight is one contiguous slice
+HOURS_CYCLE = tuple(range(24)) * 2
+
+
+def _session_hour_mask(trade_sessions: Dict) -> int:
+    """
+    Pack the GMT hours covered by the enabled trading sessions into a bitmask
+
+    Args:
+        trade_sessions: Session config dict (name -> start/end/enabled)
+
+    Returns:
+        int with bit h set when hour h (0-23) is tradeable
+    """
+    hours = set()
+
+    for session_config in trade_sessions.values():
+        if not session_config['enabled']:
+            continue
+
+        start_hour = int(session_config['start'].split(':')[0])
+        end_hour = int(session_config['end'].split(':')[0])
+
+        # Sessions that cross midnight wrap into the second day of the cycle
+        hours.update(HOURS_CYCLE[start_hour:start_hour + (end_hour - start_hour) % 24])
+
+    return sum(1 << hour for hour in hours)
+
 
 class SignalDetector:
     """Detect entry signals based on confluence of multiple factors"""
@@ -32,6 +60,13 @@ class SignalDetector:
         self.volume_profile = VolumeProfile()
         self.htf_levels = HTFLevels()
 
+        # Per-symbol (bars_key, vp_signals, htf_levels) from the last detection,
+        # bars_key being the latest H1/D1/W1 bar times and values
+        self._level_cache = {}
+
+        # (TRADE_SESSIONS, TRADE_DAYS, hour_mask, day_mask) - rebuilt when the config is reloaded
+        self._session_cache = (None, None, 0, 0)
+
     def detect_signal(
         self,
         current_data: pd.DataFrame,
@@ -92,7 +127,24 @@ class SignalDetector:
             signal['direction'] = 'buy' if vwap_signals['direction'] == 'below' else 'sell'
 
         # 2. Check Volume Profile signals
-        vp_signals = self.volume_profile.get_signals(current_data, price, lookback=200)
+        # Profiles and HTF levels only change when new bars arrive or the
+        # forming bars move, so reuse them until the latest H1/D1/W1 bars
+        # (time, high, low and close, plus H1 volume for the profile) differ from the
+        # last detection
+        d1_bar = daily_data.iloc[-1]
+        w1_bar = weekly_data.iloc[-1]
+        bars_key = (
+            current_data.index[-1], latest['high'], latest['low'], price, latest['volume'],
+            daily_data.index[-1], d1_bar['high'], d1_bar['low'], d1_bar['close'],
+            weekly_data.index[-1], w1_bar['high'], w1_bar['low'], w1_bar['close'],
+        )
+        cached = self._level_cache.get(symbol)
+        if cached is not None and cached[0] == bars_key:
+            _, vp_signals, htf_levels = cached
+        else:
+            vp_signals = self.volume_profile.get_signals(current_data, price, lookback=200)
+            htf_levels = self.htf_levels.get_all_levels(daily_data, weekly_data)
+            self._level_cache[symbol] = (bars_key, vp_signals, htf_levels)
         signal['vp_signals'] = vp_signals
 
         if vp_signals['at_poc']:
@@ -120,7 +172,6 @@ class SignalDetector:
             signal['factors'].append('Swing Low')
 
         # 3. Check HTF levels (CRITICAL - highest weights)
-        htf_levels = self.htf_levels.get_all_levels(daily_data, weekly_data)
         htf_confluence = self.htf_levels.check_confluence(price, htf_levels, LEVEL_TOLERANCE_PCT)
 
         signal['htf_signals'] = htf_confluence
@@ -133,7 +184,7 @@ class SignalDetector:
         # 5. Apply trend filter (if enabled)
         if signal['should_trade'] and TREND_FILTER_ENABLED:
             # Calculate ADX
-            data_with_adx = calculate_adx(current_data.copy(), period=ADX_PERIOD)
+            data_with_adx = calculate_adx(current_data, period=ADX_PERIOD)
             latest_adx = data_with_adx.iloc[-1]
 
             adx_value = latest_adx['adx']
@@ -279,37 +330,21 @@ class SignalDetector:
         Returns:
             List of filtered signals
         """
-        from config.strategy_config import TRADE_SESSIONS
+        from config.strategy_config import TRADE_SESSIONS, TRADE_DAYS
 
-        hour = current_time.hour
-        day_of_week = current_time.weekday()
+        # Session hours and days only change when strategy_config is reloaded
+        sessions, days, hour_mask, day_mask = self._session_cache
+        if sessions is not TRADE_SESSIONS or days is not TRADE_DAYS:
+            hour_mask = _session_hour_mask(TRADE_SESSIONS)
+            day_mask = sum(1 << day for day in set(TRADE_DAYS))
+            self._session_cache = (TRADE_SESSIONS, TRADE_DAYS, hour_mask, day_mask)
 
         # Check if in trading hours
-        in_session = False
-
-        for session_name, session_config in TRADE_SESSIONS.items():
-            if not session_config['enabled']:
-                continue
-
-            start_hour = int(session_config['start'].split(':')[0])
-            end_hour = int(session_config['end'].split(':')[0])
-
-            # Handle sessions that cross midnight
-            if start_hour > end_hour:
-                if hour >= start_hour or hour < end_hour:
-                    in_session = True
-                    break
-            else:
-                if start_hour <= hour < end_hour:
-                    in_session = True
-                    break
-
-        if not in_session:
+        if not (hour_mask >> current_time.hour) & 1:
             return []
 
         # Check day of week
-        from config.strategy_config import TRADE_DAYS
-        if day_of_week not in TRADE_DAYS:
+        if not (day_mask >> current_time.weekday()) & 1:
             return []
 
         return signals
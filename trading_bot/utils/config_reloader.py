@@ -136,51 +136,55 @@ def print_current_config():
         print("❌ Could not load config")
         return
 
-    print()
-    print("=" * 60)
-    print("📋 CURRENT CONFIGURATION")
-    print("=" * 60)
-    print()
-
-    print("💰 LOT SIZING:")
-    print(f"   BASE_LOT_SIZE: {config['BASE_LOT_SIZE']}")
-    print(f"   USE_FIXED_LOT_SIZE: {config['USE_FIXED_LOT_SIZE']}")
-    print()
-
-    print("🔲 GRID TRADING:")
-    print(f"   ENABLED: {config['GRID_ENABLED']}")
-    print(f"   SPACING: {config['GRID_SPACING_PIPS']} pips")
-    print(f"   MAX_LEVELS: {config['MAX_GRID_LEVELS']}")
-    print(f"   LOT_SIZE: {config['GRID_LOT_SIZE']}")
-    print()
-
-    print("🛡️ HEDGING:")
-    print(f"   ENABLED: {config['HEDGE_ENABLED']}")
-    print(f"   TRIGGER: {config['HEDGE_TRIGGER_PIPS']} pips")
-    print(f"   RATIO: {config['HEDGE_RATIO']}x")
-    print(f"   MAX_HEDGES: {config['MAX_HEDGES_PER_POSITION']}")
-    print()
-
-    print("📊 DCA/MARTINGALE:")
-    print(f"   ENABLED: {config['DCA_ENABLED']}")
-    print(f"   TRIGGER: {config['DCA_TRIGGER_PIPS']} pips")
-    print(f"   MAX_LEVELS: {config['DCA_MAX_LEVELS']}")
-    print(f"   MULTIPLIER: {config['DCA_MULTIPLIER']}x")
-    print()
-
-    print("⚠️ RISK MANAGEMENT:")
-    print(f"   MAX_DRAWDOWN: {config['MAX_DRAWDOWN_PERCENT']}%")
-    print(f"   MAX_POSITIONS: {config['MAX_OPEN_POSITIONS']}")
-    print(f"   MAX_PER_SYMBOL: {config['MAX_POSITIONS_PER_SYMBOL']}")
-    print()
-
-    print("📈 TREND FILTER:")
-    print(f"   ENABLED: {config['TREND_FILTER_ENABLED']}")
-    print(f"   ADX_THRESHOLD: {config['ADX_THRESHOLD']}")
-    print(f"   CANDLE_LOOKBACK: {config['CANDLE_LOOKBACK']}")
-    print()
-    print("=" * 60)
-    print()
+    # Build the report and write it in one go rather than one print per line
+    lines = []
+    lines.append('')
+    lines.append("=" * 60)
+    lines.append("📋 CURRENT CONFIGURATION")
+    lines.append("=" * 60)
+    lines.append('')
+
+    lines.append("💰 LOT SIZING:")
+    lines.append(f"   BASE_LOT_SIZE: {config['BASE_LOT_SIZE']}")
+    lines.append(f"   USE_FIXED_LOT_SIZE: {config['USE_FIXED_LOT_SIZE']}")
+    lines.append('')
+
+    lines.append("🔲 GRID TRADING:")
+    lines.append(f"   ENABLED: {config['GRID_ENABLED']}")
+    lines.append(f"   SPACING: {config['GRID_SPACING_PIPS']} pips")
+    lines.append(f"   MAX_LEVELS: {config['MAX_GRID_LEVELS']}")
+    lines.append(f"   LOT_SIZE: {config['GRID_LOT_SIZE']}")
+    lines.append('')
+
+    lines.append("🛡️ HEDGING:")
+    lines.append(f"   ENABLED: {config['HEDGE_ENABLED']}")
+    lines.append(f"   TRIGGER: {config['HEDGE_TRIGGER_PIPS']} pips")
+    lines.append(f"   RATIO: {config['HEDGE_RATIO']}x")
+    lines.append(f"   MAX_HEDGES: {config['MAX_HEDGES_PER_POSITION']}")
+    lines.append('')
+
+    lines.append("📊 DCA/MARTINGALE:")
+    lines.append(f"   ENABLED: {config['DCA_ENABLED']}")
+    lines.append(f"   TRIGGER: {config['DCA_TRIGGER_PIPS']} pips")
+    lines.append(f"   MAX_LEVELS: {config['DCA_MAX_LEVELS']}")
+    lines.append(f"   MULTIPLIER: {config['DCA_MULTIPLIER']}x")
+    lines.append('')
+
+    lines.append("⚠️ RISK MANAGEMENT:")
+    lines.append(f"   MAX_DRAWDOWN: {config['MAX_DRAWDOWN_PERCENT']}%")
+    lines.append(f"   MAX_POSITIONS: {config['MAX_OPEN_POSITIONS']}")
+    lines.append(f"   MAX_PER_SYMBOL: {config['MAX_POSITIONS_PER_SYMBOL']}")
+    lines.append('')
+
+    lines.append("📈 TREND FILTER:")
+    lines.append(f"   ENABLED: {config['TREND_FILTER_ENABLED']}")
+    lines.append(f"   ADX_THRESHOLD: {config['ADX_THRESHOLD']}")
+    lines.append(f"   CANDLE_LOOKBACK: {config['CANDLE_LOOKBACK']}")
+    lines.append('')
+    lines.append("=" * 60)
+    lines.append('')
+
+    print('\n'.join(lines))
 
 
 if __name__ == '__main__':
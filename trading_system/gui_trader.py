@@ -1212,14 +1212,21 @@ class TradingGUI:
             return
 
         try:
-            filename = f"debug_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            exported_at = datetime.now()
+            filename = f"debug_log_{exported_at.strftime('%Y%m%d_%H%M%S')}.txt"
+
+            # Build the whole export, then write it in one call
+            lines = [
+                "=" * 80 + "\n",
+                "Ganymede Trade City - Debug Log Export\n",
+                f"Exported: {exported_at.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                "=" * 80 + "\n\n",
+            ]
+            lines.extend(f"[{timestamp}] [{level.upper()}] {message}\n"
+                         for timestamp, message, level in self.debug_history)
+
             with open(filename, 'w') as f:
-                f.write("=" * 80 + "\n")
-                f.write(f"Ganymede Trade City - Debug Log Export\n")
-                f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                for timestamp, message, level in self.debug_history:
-                    f.write(f"[{timestamp}] [{level.upper()}] {message}\n")
+                f.write(''.join(lines))
 
             messagebox.showinfo("Success", f"Debug history exported to {filename}")
         except Exception as e:
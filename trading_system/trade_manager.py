@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
+import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple, Callable
 import logging
@@ -19,6 +20,9 @@ from confluence_analyzer import ConfluenceAnalyzer
 from position_managers import Position, GridManager, HedgeManager, RecoveryManager
 from risk_manager import RiskManager
 
+# Level number tag in position comments (e.g. "GTC25 grid L3")
+LEVEL_NUMBER_PATTERN = re.compile(r'L(\d+)')
+
 
 class TradeManager:
     """Main trading system orchestrator"""
@@ -422,8 +426,6 @@ class TradeManager:
         if not self.mt5_connected:
             return
 
-        import re
-
         # Get ALL positions for this symbol (not just first symbol in list)
         mt5_positions = mt5.positions_get(symbol=self.symbol)
         if not mt5_positions:
@@ -446,16 +448,16 @@ class TradeManager:
                 # Parse level info from comment if available
                 level_type = 'initial'
                 level_number = 0
-                if 'grid' in mt5_pos.comment.lower():
+                comment = mt5_pos.comment.lower()
+                if 'grid' in comment:
                     level_type = 'grid'
-                    match = re.search(r'L(\d+)', mt5_pos.comment)
-                    if match:
-                        level_number = int(match.group(1))
-                elif 'hedge' in mt5_pos.comment.lower():
+                elif 'hedge' in comment:
                     level_type = 'hedge'
-                elif 'recovery' in mt5_pos.comment.lower():
+                elif 'recovery' in comment:
                     level_type = 'recovery'
-                    match = re.search(r'L(\d+)', mt5_pos.comment)
+
+                if level_type in ('grid', 'recovery'):
+                    match = LEVEL_NUMBER_PATTERN.search(mt5_pos.comment)
                     if match:
                         level_number = int(match.group(1))
 